@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
 from typing import Optional, List
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from model.chat_log import ChatLog
 
@@ -73,4 +74,92 @@ def get_recent_user_messages(db: Session, user_id: int, days: int) -> List[ChatL
     )
 
     result = db.scalars(stmt).all()
-    return result
\ No newline at end of file
+    return result
+
+
+# ---------- async (AsyncSession) ---------- #
+async def create_chat_log_async(db: AsyncSession, user_id: str, user_message: str, assistant_response: Optional[str] = None):
+    return await create_chat_log_with_program_async(db, user_id, user_message, assistant_response)
+
+async def create_chat_log_with_program_async(
+        db: AsyncSession,
+        user_id: str,
+        user_message: str,
+        assistant_response: Optional[str] = None,
+        recommended_program: Optional[str] = None
+):
+    chat_log = ChatLog(
+        user_id=int(user_id),
+        user_message=user_message,
+        assistant_response = assistant_response,
+        recommended_program = recommended_program
+    )
+
+    db.add(chat_log)
+    await db.commit()
+    await db.refresh(chat_log)
+    return chat_log
+
+async def insert_chat_logs_async(db: AsyncSession, rows: List[dict]) -> None:
+    """
+    여러 대화 로그를 INSERT 한 번(multi-row VALUES)으로 저장 후 commit
+    - rows: user_id, user_message, assistant_response, recommended_program, created_at, updated_at
+    """
+    if not rows:
+        return
+    await db.execute(insert(ChatLog).values(rows))
+    await db.commit()
+
+async def get_chat_logs_page_async(
+    db: AsyncSession,
+    user_id: str,
+    limit: int,
+    before_id: Optional[int] = None,
+) -> list:
+    """
+    내 대화 기록을 최신순(id DESC)으로 limit개 조회 (keyset 페이지네이션)
+    - before_id: 이전 페이지 마지막 id, 이 값보다 작은 id부터 조회
+    - 목록에 필요한 컬럼만 조회 (ORM 객체를 만들지 않음), 없으면 빈 목록
+    """
+    stmt = (
+        select(
+            ChatLog.id,
+            ChatLog.user_message,
+            ChatLog.assistant_response,
+            ChatLog.recommended_program,
+            ChatLog.created_at,
+        )
+        .where(ChatLog.user_id == int(user_id))
+        .order_by(ChatLog.id.desc())
+        .limit(limit)
+    )
+    if before_id is not None:
+        stmt = stmt.where(ChatLog.id < before_id)
+    return (await db.execute(stmt)).all()
+
+async def get_last_recommended_program_by_user_id_async(user_id: str, db: AsyncSession) -> Optional[str]:
+    """
+        get_last_recommended_program_by_user_id의 async 버전
+    """
+    stmt = (
+        select(ChatLog.recommended_program)
+        .where(ChatLog.user_id == int(user_id))
+        .where(ChatLog.recommended_program.isnot(None))
+        .order_by(ChatLog.id.desc())
+        .limit(1)
+    )
+    return await db.scalar(stmt)
+
+async def get_recent_user_messages_async(db: AsyncSession, user_id: int, days: int) -> List[ChatLog]:
+    """
+        get_recent_user_messages의 async 버전
+    """
+    time_threshold = datetime.now() - timedelta(days=days)
+
+    stmt = (
+        select(ChatLog)
+        .where(ChatLog.user_id == int(user_id))
+        .where(ChatLog.created_at >= time_threshold)
+        .order_by(ChatLog.created_at.desc())
+    )
+    return (await db.scalars(stmt)).all()
@@ -1,9 +1,11 @@
 from os.path import exists
 
 from fastapi import HTTPException
-from select import select
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from model.personality import Personality
+from utils.recommend_cache import invalidate_user_recommendations, invalidate_user_recommendations_async
 
 def is_exist_personality(db: Session, user_id: str) -> bool:
     return db.query(db.query(Personality).filter(Personality.user_id == user_id).exists()).scalar()
@@ -16,6 +18,16 @@ def get_latest_personality_by_user_id(db: Session, user_id: int) -> Personality
 
     return result
 
+async def get_latest_personality_by_user_id_async(db: AsyncSession, user_id: int) -> Personality | None:
+    result = await db.scalar(
+        select(Personality).where(Personality.user_id == int(user_id)).order_by(Personality.id.desc()).limit(1)
+    )
+
+    if not result:
+        raise HTTPException(status_code=404, detail="유저 정보를 찾을 수 없습니다")
+
+    return result
+
 def create_personality(
     db: Session,
     user_id: int,
@@ -36,6 +48,7 @@ def create_personality(
     db.add(personality)
     db.commit()
     db.refresh(personality)
+    invalidate_user_recommendations(user_id)
     return personality
 
 def update_latest_personality_by_user_id(
@@ -67,5 +80,36 @@ def update_latest_personality_by_user_id(
 
     db.commit()
     db.refresh(latest_personality)
+    invalidate_user_recommendations(user_id)
+
+    return latest_personality
+
+async def update_latest_personality_by_user_id_async(
+    db: AsyncSession,
+    user_id: int,
+    ei: str,
+    sn: str,
+    tf: str,
+    pj: str,
+    personality_tags: str
+):
+    """
+    update_latest_personality_by_user_id의 async 버전
+    """
+    latest_personality = await db.scalar(
+        select(Personality).where(Personality.user_id == int(user_id)).order_by(Personality.id.desc()).limit(1)
+    )
+
+    if not latest_personality:
+        raise HTTPException(status_code=404, detail="사용자의 성향 정보가 없습니다.")
+
+    latest_personality.ei = ei
+    latest_personality.sn = sn
+    latest_personality.tf = tf
+    latest_personality.pj = pj
+    latest_personality.tag = personality_tags
+
+    await db.commit()
+    await invalidate_user_recommendations_async(user_id)
 
-    return latest_personality
\ No newline at end of file
+    return latest_personality
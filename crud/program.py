@@ -1,8 +1,11 @@
 from typing import List, Type
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
-from model.program import Program
+from sqlalchemy import and_, or_, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from model.program import Program, program_tag
+from model.tag import Tag
 
 def get_all_programs(db: Session) -> list[Type[Program]]:
     result = db.query(Program).options(joinedload(Program.center)).all()
@@ -28,6 +31,94 @@ def get_program_by_id(db: Session, program_id: int) -> Type[Program]:
     return program
 
 def get_program_by_keyword(db: Session, keyword: str) -> list[Type[Program]]:
-    program = db.query(Program).filter(Program.name.like(f"%{keyword}%")).all()
+    # 프로그램명 부분 일치 + 대분류/중분류 키워드('운동', '실외' 등) 일치
+    program = db.query(Program).filter(
+        or_(
+            Program.name.like(f"%{keyword}%"),
+            Program.main_category == keyword,
+            Program.sub_category == keyword,
+        )
+    ).all()
 
-    return program
\ No newline at end of file
+    return program
+
+def _tag_overlap_stmt(
+    tag_names: list[str],
+    min_overlap: int,
+    after: tuple[int, int] | None,
+    limit: int | None,
+):
+    tag_ids = select(Tag.id).where(Tag.name.in_(tag_names))
+    matched = (
+        select(program_tag.c.program_id, func.count().label("overlap"))
+        .where(program_tag.c.tag_id.in_(tag_ids))
+        .group_by(program_tag.c.program_id)
+        .having(func.count() >= min_overlap)
+        .subquery()
+    )
+    stmt = (
+        select(Program, matched.c.overlap)
+        .join(matched, Program.id == matched.c.program_id)
+        .options(selectinload(Program.tags), selectinload(Program.center))
+        .order_by(matched.c.overlap.desc(), Program.id)
+    )
+    if after is not None:
+        score, program_id = after
+        stmt = stmt.where(
+            or_(
+                matched.c.overlap < score,
+                and_(matched.c.overlap == score, Program.id > program_id),
+            )
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def get_programs_by_tag_overlap(
+    db: Session,
+    tag_names: list[str],
+    min_overlap: int = 2,
+    after: tuple[int, int] | None = None,
+    limit: int | None = None,
+) -> list[tuple[Program, int]]:
+    """
+    태그 교집합 계산을 DB로 내려보내는 조회
+    - 사용자 태그 이름 → tag id 로 바꾼 뒤 program_tag에서
+      GROUP BY program_id HAVING COUNT(*) >= min_overlap
+    - 매칭된 프로그램만 tags/center를 selectinload
+    - 겹친 태그 수 내림차순, id 오름차순 정렬
+    - after=(점수, id): 해당 위치 다음부터 (keyset 페이지네이션), limit: 최대 개수
+    - 반환: [(프로그램, 겹친 태그 수)]
+    """
+    stmt = _tag_overlap_stmt(tag_names, min_overlap, after, limit)
+    return [(program, overlap) for program, overlap in db.execute(stmt).all()]
+
+
+# ---------- async (AsyncSession) ---------- #
+async def get_program_by_name_async(db: AsyncSession, program_name: str) -> Program:
+    program = await db.scalar(select(Program).where(Program.name == program_name).limit(1))
+    if not program:
+        raise HTTPException(status_code=404, detail="프로그램 정보를 찾을 수 없습니다.")
+
+    return program
+
+async def get_program_by_id_async(db: AsyncSession, program_id: int) -> Program:
+    program = await db.get(Program, program_id)
+
+    if not program:
+        raise HTTPException(status_code=404, detail="프로그램 정보를 찾을 수 없습니다.")
+
+    return program
+
+async def get_programs_by_tag_overlap_async(
+    db: AsyncSession,
+    tag_names: list[str],
+    min_overlap: int = 2,
+    after: tuple[int, int] | None = None,
+    limit: int | None = None,
+) -> list[tuple[Program, int]]:
+    """
+    get_programs_by_tag_overlap의 async 버전 (tags/center는 selectinload로 미리 로드됨)
+    """
+    stmt = _tag_overlap_stmt(tag_names, min_overlap, after, limit)
+    return [(program, overlap) for program, overlap in (await db.execute(stmt)).all()]
@@ -1,7 +1,10 @@
 from typing import List
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from model.schedule import Schedule
 from model.user import User
@@ -22,8 +25,20 @@ def create_schedule(
     db.refresh(schedule)
     return schedule
 
+def _schedule_load_options():
+    """
+    ScheduleResponseSchema 직렬화에 필요한 관계를 미리 로드 (일정 수와 관계없이 쿼리 3회)
+    - schedule + center: JOIN
+    - program + program.center: selectin 1회 (JOIN)
+    - program.tags: selectin 1회
+    """
+    return (
+        joinedload(Schedule.center),
+        selectinload(Schedule.program).options(joinedload(Program.center), selectinload(Program.tags)),
+    )
+
 def get_all_schedules_by_id(db: Session, user_id: int) -> List[Schedule]:
-    schedules = db.query(Schedule).filter_by(user_id=user_id).all()
+    schedules = db.query(Schedule).options(*_schedule_load_options()).filter_by(user_id=user_id).all()
 
     if not schedules:
         raise HTTPException(status_code=404, detail="등록된 스케줄이 없습니다.")
@@ -37,3 +52,66 @@ def existing_schedule(db: Session, user_id: int, program_id: int):
         raise HTTPException(status_code=409, detail="이미 등록된 일정입니다.")
 
     return existing
+
+
+# ---------- async (AsyncSession) ---------- #
+def _is_duplicate(e: IntegrityError) -> bool:
+    # MySQL 1062 Duplicate entry / SQLite UNIQUE constraint failed
+    args = getattr(e.orig, "args", ())
+    return (bool(args) and args[0] == 1062) or "UNIQUE constraint failed" in str(e.orig)
+
+def _is_foreign_key_violation(e: IntegrityError) -> bool:
+    # MySQL 1452 Cannot add or update a child row / SQLite FOREIGN KEY constraint failed
+    args = getattr(e.orig, "args", ())
+    return (bool(args) and args[0] == 1452) or "FOREIGN KEY constraint failed" in str(e.orig)
+
+async def get_all_schedules_by_id_async(db: AsyncSession, user_id: int) -> List[Schedule]:
+    schedules = (await db.scalars(
+        select(Schedule)
+        .options(*_schedule_load_options())
+        .where(Schedule.user_id == int(user_id))
+        .order_by(Schedule.id)
+    )).unique().all()
+
+    if not schedules:
+        raise HTTPException(status_code=404, detail="등록된 스케줄이 없습니다.")
+
+    return schedules
+
+async def get_schedule_rows_by_user_id_async(db: AsyncSession, user_id: int) -> list:
+    """
+    일정 컬럼만 조회 (program/center는 호출하는 쪽에서 카탈로그로 채움)
+    """
+    stmt = (
+        select(Schedule.id, Schedule.user_id, Schedule.created_at, Schedule.program_id, Schedule.center_id)
+        .where(Schedule.user_id == int(user_id))
+        .order_by(Schedule.id)
+    )
+    return (await db.execute(stmt)).all()
+
+async def register_schedule_async(db: AsyncSession, user_id: int, program_id: int) -> int:
+    """
+    일정 등록을 SQL 한 번으로 처리 (반환: schedule id)
+    - INSERT INTO schedule (user_id, program_id, center_id) SELECT ?, id, center_id FROM program WHERE id = ?
+    - 중복 확인은 UNIQUE(user_id, program_id)에 맡김 → 동시에 눌러도 한 건만 저장, 나머지는 409
+    - 프로그램이 없으면 404, 사용자가 없으면(FK 위반) 404, 그 밖의 무결성 오류는 그대로 전달
+    """
+    stmt = insert(Schedule).from_select(
+        ["user_id", "program_id", "center_id"],
+        select(literal(user_id), Program.id, Program.center_id).where(Program.id == program_id),
+    )
+    try:
+        result = await db.execute(stmt)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_duplicate(e):
+            raise HTTPException(status_code=409, detail="이미 등록된 일정입니다.")
+        if _is_foreign_key_violation(e):
+            raise HTTPException(status_code=404, detail="유저 정보를 찾을 수 없습니다.")
+        raise
+
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="프로그램 정보를 찾을 수 없습니다.")
+
+    return result.lastrowid
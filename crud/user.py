@@ -1,4 +1,5 @@
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from model.user import User
 
@@ -8,4 +9,12 @@ def get_user_by_id(db: Session, user_id: int) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
\ No newline at end of file
+    return user
+
+async def get_user_by_id_async(db: AsyncSession, user_id: int) -> User:
+    user = await db.get(User, int(user_id))
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return user
@@ -0,0 +1,140 @@
+"""
+ReturnZero(VITO) STT API 로컬 대역 서버 (부하 테스트/오프라인 개발용)
+
+실행:
+    uvicorn dev.return_zero_stub:app --port 5001
+
+.env 설정 예:
+    RETURN_ZERO_JWT_URL=http://localhost:5001/v1/authenticate
+    RETURN_ZERO_URL=http://localhost:5001/v1/transcribe
+    RETURN_ZERO_STREAM_URL=ws://localhost:5001/v1/transcribe:streaming
+
+환경 변수:
+    STUB_STT_DELAY   전사 완료까지 걸리는 시간(초, 기본 1.0)
+    STUB_STT_TEXT    전사 결과 문장 (기본 "요가 프로그램 있어요?")
+    STUB_STT_FAIL    0~1 사이 실패 비율 (기본 0)
+    STUB_POLL_LIMIT  초당 허용 폴링 수 (초과 시 429, 기본 0 = 제한 없음)
+
+스트리밍: 바이너리 청크마다 partial 결과를 보내고, 발화 뒤 무음(0으로만 채워진) 청크가 오거나
+"EOS"를 받으면 final 결과를 보냄 (EOS 후 연결 종료)
+"""
+import os
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, File, Form, Header, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+STUB_STT_DELAY = float(os.getenv("STUB_STT_DELAY", "1.0"))
+STUB_STT_TEXT = os.getenv("STUB_STT_TEXT", "요가 프로그램 있어요?")
+STUB_STT_FAIL = float(os.getenv("STUB_STT_FAIL", "0"))
+STUB_POLL_LIMIT = int(os.getenv("STUB_POLL_LIMIT", "0"))
+STUB_TOKEN_TTL = 60 * 60 * 6
+
+app = FastAPI(title="ReturnZero STT stub")
+
+# id → (완료 시각, 실패 여부)
+_jobs: dict[str, tuple[float, bool]] = {}
+_poll_window = {"second": 0, "count": 0}
+
+
+def _check_token(authorization: str | None):
+    if not authorization or not authorization.startswith("Bearer stub-"):
+        raise HTTPException(status_code=401, detail="invalid token")
+
+
+@app.post("/v1/authenticate")
+async def authenticate(client_id: str = Form(None), client_secret: str = Form(None)):
+    return {"access_token": f"stub-{uuid.uuid4().hex}", "expire_at": int(time.time()) + STUB_TOKEN_TTL}
+
+
+@app.post("/v1/transcribe")
+async def request_transcribe(
+    file: UploadFile = File(...),
+    config: str = Form("{}"),
+    authorization: str | None = Header(None),
+):
+    _check_token(authorization)
+    await file.read()
+    transcribe_id = uuid.uuid4().hex
+    _jobs[transcribe_id] = (time.monotonic() + STUB_STT_DELAY, random.random() < STUB_STT_FAIL)
+    return {"id": transcribe_id}
+
+
+@app.get("/v1/transcribe/{transcribe_id}")
+async def get_transcribe(transcribe_id: str, authorization: str | None = Header(None)):
+    _check_token(authorization)
+
+    if STUB_POLL_LIMIT:
+        second = int(time.time())
+        if _poll_window["second"] != second:
+            _poll_window["second"], _poll_window["count"] = second, 0
+        _poll_window["count"] += 1
+        if _poll_window["count"] > STUB_POLL_LIMIT:
+            return JSONResponse(status_code=429, content={"code": "A0002", "msg": "too many requests"})
+
+    job = _jobs.get(transcribe_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="not found")
+
+    done_at, failed = job
+    if time.monotonic() < done_at:
+        return {"id": transcribe_id, "status": "transcribing"}
+
+    _jobs.pop(transcribe_id, None)
+    if failed:
+        return {"id": transcribe_id, "status": "failed", "error": {"code": "E500", "message": "stub failure"}}
+    return {
+        "id": transcribe_id,
+        "status": "completed",
+        "results": {"utterances": [{"start_at": 0, "duration": 1000, "msg": STUB_STT_TEXT, "spk": 0}]},
+    }
+
+
+def _stream_result(seq: int, text: str, final: bool) -> dict:
+    return {
+        "seq": seq,
+        "start_at": 0,
+        "duration": 0,
+        "final": final,
+        "alternatives": [{"text": text, "confidence": 0.9}],
+    }
+
+
+@app.websocket("/v1/transcribe:streaming")
+async def transcribe_streaming(websocket: WebSocket):
+    authorization = websocket.headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer stub-"):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+
+    seq = 0
+    speech_chunks = 0
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            chunk = message.get("bytes")
+            if chunk is not None:
+                if any(chunk):
+                    speech_chunks += 1
+                    partial = STUB_STT_TEXT[:min(len(STUB_STT_TEXT), speech_chunks * 3)]
+                    await websocket.send_json(_stream_result(seq, partial, False))
+                elif speech_chunks:
+                    # 발화 끝 (무음) → final
+                    await websocket.send_json(_stream_result(seq, STUB_STT_TEXT, True))
+                    seq += 1
+                    speech_chunks = 0
+                continue
+
+            if message.get("text") == "EOS":
+                if speech_chunks:
+                    await websocket.send_json(_stream_result(seq, STUB_STT_TEXT, True))
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        return
@@ -1,5 +1,8 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
 # router module
@@ -8,15 +11,42 @@ from routes.schedule_route import schedule_router
 from routes.recommend_routes import recommend_router
 from routes.personality_route import personality_router
 from routes.chat_route import chat_router
+from utils.audio_utils import shutdown_audio_pool
+from utils.catalog import warm_catalog
+from utils.chat_log_writer import chat_log_writer
+from utils.database import SessionLocal, close_db_engines
+from utils.redis_utils import init_redis_pools, close_redis_pools
+from utils.gpt_utils import close_gpt_client
+from utils.stt_jobs import shutdown_stt_jobs
+from utils.stt_utils import close_stt_client
 
 # .env 로드
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 프로세스 공용 Redis 커넥션 풀
+    init_redis_pools()
+    # 프로그램 카탈로그 스냅샷 미리 로드
+    await run_in_threadpool(warm_catalog, SessionLocal)
+    yield
+    # 종료 시 진행 중인 음성 작업 취소, 남은 대화 로그 저장 후 공유 커넥션 정리
+    await shutdown_stt_jobs()
+    await chat_log_writer.close()
+    await close_gpt_client()
+    await close_stt_client()
+    shutdown_audio_pool()
+    await close_redis_pools()
+    await close_db_engines()
+
+
 app = FastAPI(
     title="어르심 AI API",
     version="1.0.0",
     description="어르심 서비스 AI 관련 API입니다.",
-    root_path="/ai"
+    root_path="/ai",
+    lifespan=lifespan,
 )
 
 origins = [
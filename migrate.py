@@ -167,6 +167,14 @@ def migrate_csv_to_db(csv_file_path):
     for pname in program_names:
         analyze_program_category(pname)
 
+    # 4) 실행 중인 서버들이 프로그램 카탈로그 스냅샷을 다시 읽도록 버전 갱신
+    #    (Redis 설정이 없어도 마이그레이션은 돌 수 있도록 여기서 import)
+    try:
+        from utils.catalog import bump_catalog_version
+        print(f"[INFO] 카탈로그 버전 갱신: {bump_catalog_version()}")
+    except Exception as e:
+        print(f"[ERROR] 카탈로그 버전 갱신 실패 (python -m utils.catalog --bump 로 다시 실행): {e}")
+
 if __name__ == "__main__":
     csv_path = "data/elderly_program.CSV"
     migrate_csv_to_db(csv_path)
@@ -0,0 +1,3 @@
+-- GET /chat/log keyset 페이지네이션
+-- WHERE user_id = ? [AND id < ?] ORDER BY id DESC LIMIT ? 를 인덱스 범위 스캔 한 번으로 처리
+CREATE INDEX ix_chat_logs_user_id_id ON chat_logs (user_id, id);
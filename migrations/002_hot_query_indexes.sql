@@ -0,0 +1,12 @@
+-- 자주 호출되는 crud 조회용 인덱스 (python -m utils.query_plan 으로 실행 계획 확인)
+-- 마지막 추천 프로그램 조회는 001의 ix_chat_logs_user_id_id 를 역순으로 읽어 처리
+-- 최신 성향 조회는 personality.user_id UNIQUE 인덱스로 처리
+
+-- get_recent_user_messages (user_id = ? AND created_at >= ?)
+CREATE INDEX ix_chat_logs_user_id_created_at ON chat_logs (user_id, created_at);
+
+-- existing_schedule (user_id = ? AND program_id = ?)
+CREATE INDEX ix_schedule_user_id_program_id ON schedule (user_id, program_id);
+
+-- get_program_by_name (name = ?)
+CREATE INDEX ix_program_name ON program (name);
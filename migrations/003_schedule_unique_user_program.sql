@@ -0,0 +1,14 @@
+-- schedule(user_id, program_id) 중복 등록 방지
+-- crud.schedule.register_schedule_async 가 이 제약으로 중복을 판단 (IntegrityError → 409)
+
+-- 1) 기존 중복 행 정리 (가장 먼저 등록된 행만 남김)
+DELETE s1 FROM schedule s1
+JOIN schedule s2
+  ON s1.user_id = s2.user_id
+ AND s1.program_id = s2.program_id
+ AND s1.id > s2.id;
+
+-- 2) 002의 일반 인덱스를 UNIQUE 제약으로 교체 (user_id FK 인덱스가 비지 않도록 한 문장으로)
+ALTER TABLE schedule
+  DROP INDEX ix_schedule_user_id_program_id,
+  ADD CONSTRAINT uq_schedule_user_id_program_id UNIQUE (user_id, program_id);
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,6 +11,13 @@ if TYPE_CHECKING:
 
 class ChatLog(BaseLongIdEntity):
     __tablename__ = "chat_logs"
+    __table_args__ = (
+        # 대화 기록 keyset 페이지네이션 (user_id = ? AND id < ? ORDER BY id DESC)
+        # 마지막 추천 프로그램 조회(recommended_program IS NOT NULL ORDER BY id DESC)도 이 인덱스를 역순으로 읽음
+        Index("ix_chat_logs_user_id_id", "user_id", "id"),
+        # 최근 N일 대화 조회 (user_id = ? AND created_at >= ?)
+        Index("ix_chat_logs_user_id_created_at", "user_id", "created_at"),
+    )
 
     user_message: Mapped[str] = mapped_column(String(500), nullable=False)
     assistant_response: Mapped[str] = mapped_column(String(1000), nullable=False)
@@ -17,3 +17,10 @@ class Personality(BaseLongIdEntity):
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, unique=True)
     user: Mapped["User"] = relationship("User", back_populates="personality")
+
+    @property
+    def tag_list(self) -> list[str]:
+        """
+        "태그1, 태그2" 형태로 저장된 성향 태그를 공백/빈 값 없이 목록으로 (추천 memory/sql 모드 공통)
+        """
+        return [tag.strip() for tag in str(self.tag or "").split(",") if tag.strip()]
@@ -20,7 +20,7 @@ program_tag = Table(
 class Program(BaseLongIdEntity):
     __tablename__ = "program"
 
-    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)   # 프로그램명 정확히 일치 조회
     fir_day: Mapped[str] = mapped_column(String(20), nullable=False)
     sec_day: Mapped[str | None] = mapped_column(String(20))
     thr_day: Mapped[str | None] = mapped_column(String(20))
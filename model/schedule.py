@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from model.base import BaseLongIdEntity
 from typing import TYPE_CHECKING
@@ -10,6 +10,10 @@ if TYPE_CHECKING:
 
 class Schedule(BaseLongIdEntity):
     __tablename__ = "schedule"
+    __table_args__ = (
+        # 같은 프로그램 중복 등록 방지 (동시 요청도 DB에서 한 건만 허용)
+        UniqueConstraint("user_id", "program_id", name="uq_schedule_user_id_program_id"),
+    )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     program_id: Mapped[int] = mapped_column(ForeignKey("program.id"), nullable=False)
@@ -1,52 +1,67 @@
-from typing import List, Optional
+import asyncio
+import json
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi import APIRouter, HTTPException, Query, UploadFile, WebSocket, WebSocketDisconnect, status
 from fastapi.params import Depends, File, Form
-from fastapi.responses import JSONResponse
-from redis import Redis
-from sqlalchemy.orm import Session
-
-from crud.chat_log import get_last_recommended_program_by_user_id, create_chat_log, create_chat_log_with_program, \
-    get_chat_log_by_id
-from crud.program import get_program_by_name
-from crud.schedule import create_schedule, existing_schedule
-from crud.user import get_user_by_id
-from schemas.chatlog_schema import ChatLogResponse
-from utils.database import get_db
-from utils.gpt_utils import gpt_call
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.websockets import WebSocketState
+from websockets.exceptions import ConnectionClosed
+
+from crud.chat_log import get_last_recommended_program_by_user_id_async, get_chat_logs_page_async
+from crud.program import get_program_by_name_async
+from crud.schedule import register_schedule_async
+from schemas.chatlog_schema import ChatLogItem, ChatLogPageSchema
+from utils.chat_log_writer import chat_log_writer
+from utils.database import get_async_db, AsyncSessionLocal
+from utils.dialog_state import get_dialog_state, mark_confirmed, save_recommendation
+from utils.gpt_utils import gpt_call_async, gpt_stream_async
 from utils.chat_utils import (
     recommend_random_program,
     search_program_and_build_message,
-    extract_requested_program,
+    plan_turn,
+    TURN_INTENT_CHAT,
 )
-from schemas.chatbot_schema import ChatbotRequest
-from utils.redis_utils import get_redis_client
+from schemas.chatbot_schema import ChatbotRequest, SttJobResponse
 from utils.stt_utils import try_stt
-from utils.jwt_utils import verify_token 
+from utils.stt_jobs import JOB_QUEUED, get_job, submit_stt_job
+from utils.stt_stream import STT_STREAM_EOS, open_stt_stream, parse_stt_message
+from utils.jwt_utils import decode_user_id, verify_token
 
 # API router
 chat_router = APIRouter()
 
 
-@chat_router.get("/log", response_model=List[ChatLogResponse])
-def get_my_log(
+@chat_router.get("/log", response_model=ChatLogPageSchema)
+async def get_my_log(
+    limit: int = Query(20, ge=1, le=100, description="한 번에 받을 대화 수"),
+    before_id: Optional[int] = Query(None, description="이전 응답의 next_before_id"),
     user_id: str = Depends(verify_token),     # JWT → user_id 추출
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     내 대화 기록 조회 (JWT 토큰에서 user_id 추출)
+    - 최신순으로 limit 개씩 반환하고, 더 오래된 기록은 next_before_id로 조회
+    - 기록이 없으면 빈 목록
     """
-    return get_chat_log_by_id(db, user_id)
+    # 다음 페이지 존재 여부 확인용으로 1개 더
+    rows = await get_chat_logs_page_async(db, user_id, limit + 1, before_id)
+    page = rows[:limit]
+    return ChatLogPageSchema(
+        items=[ChatLogItem.model_validate(row) for row in page],
+        next_before_id=page[-1].id if len(rows) > limit else None,
+    )
 
 
 @chat_router.post("")
-def chat_with_msg(
+async def chat_with_msg(
     body: ChatbotRequest,
     user_id: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     user_message = body.message
-    chatbot_response = get_chatbot_response(user_id, user_message, db)
+    chatbot_response = await get_chatbot_response(user_id, user_message, db)
 
     return JSONResponse(
         status_code=200,
@@ -57,12 +72,28 @@ def chat_with_msg(
     )
 
 
+@chat_router.post("/stream")
+async def chat_with_msg_stream(
+    body: ChatbotRequest,
+    user_id: str = Depends(verify_token),
+):
+    """
+    챗봇 대화 (스트리밍, text/event-stream)
+    - planner 결과(plan)를 먼저 보내고, 응답 텍스트를 생성되는 대로(delta) 전송
+    - 마지막 done 이벤트에 전체 응답이 담기며 이때 대화 로그가 저장됨
+    """
+    return StreamingResponse(
+        stream_chatbot_response(user_id, body.message),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @chat_router.post("/record")
 async def post_record(
     audio_file: Optional[UploadFile] = File(None),
     token_user_id: str = Depends(verify_token),       # 토큰 → user_id
-    db: Session = Depends(get_db),
-    redis: Redis = Depends(get_redis_client),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     챗봇 STT API
@@ -74,13 +105,15 @@ async def post_record(
 
     # 🎙️ STT 처리
     try:
-        user_message = await try_stt(audio_file, redis)
+        user_message = await try_stt(audio_file)
+    except asyncio.TimeoutError:
+        raise HTTPException(504, "STT 변환 시간이 초과되었습니다.")
     except Exception as e:
         raise HTTPException(500, f"STT 변환 실패: {e}")
 
     # 🤖 챗봇 응답
     try:
-        chatbot_response = get_chatbot_response(user_id, user_message, db)
+        chatbot_response = await get_chatbot_response(user_id, user_message, db)
     except Exception as e:
         raise HTTPException(500, f"챗봇 응답 생성 실패: {e}")
 
@@ -94,126 +127,290 @@ async def post_record(
     )
 
 
-def get_chatbot_response(user_id: str, user_message: str, db: Session):
-    # (A) "예", "등록" 등으로 일정 등록 의사 표시
-    if user_message.lower() in ["예", "네", "등록", "등록할래요"]:
-        # 1) 최근 recommended_program 찾기 (프로그램명)
-        recommended_program = get_last_recommended_program_by_user_id(user_id, db)
-        if not recommended_program:
-            raise HTTPException(
-                status_code=400,
-                detail="최근에 추천된 프로그램이 없습니다."
-            )
-
-        # 2) DB에서 해당 프로그램의 추가 정보를 조회 (요일1~요일5, 시작시간, 종료시간)
-        print(recommended_program)
-        program = get_program_by_name(db, recommended_program)
-        user = get_user_by_id(db, int(user_id))
-
-        # 이미 등록돼 있으면 안됨됨
-        if existing_schedule(db, user.id, program.id):
-            raise HTTPException(status_code=409, detail="이미 등록된 일정입니다")
-
-        # 3) schedule_route.py의 save_schedule 함수는 새 스키마에 맞춰 9개의 인자를 받으므로 호출
-        schedule = create_schedule(
-            db,
-            user,
-            program,
-            program.center
+@chat_router.post("/record/jobs", status_code=202, response_model=SttJobResponse)
+async def post_record_job(
+    audio_file: UploadFile = File(...),
+    token_user_id: str = Depends(verify_token),
+):
+    """
+    챗봇 STT 비동기 API
+    - 음성 파일만 받고 job_id를 바로 반환 (STT + 챗봇 응답은 백그라운드에서 처리)
+    - 결과는 GET /chat/record/jobs/{job_id} 로 조회
+    """
+    audio_bytes = await audio_file.read()
+    if not audio_bytes:
+        raise HTTPException(400, "음성 파일이 비어 있습니다.")
+
+    job_id = await submit_stt_job(
+        token_user_id, audio_bytes, audio_file.filename, audio_file.content_type, get_chatbot_response
+    )
+    return SttJobResponse(job_id=job_id, status=JOB_QUEUED)
+
+
+@chat_router.get("/record/jobs/{job_id}", response_model=SttJobResponse)
+async def get_record_job(
+    job_id: str,
+    token_user_id: str = Depends(verify_token),
+):
+    """
+    음성 작업 상태 조회
+    - status: queued → transcribing → responding → completed / failed
+    - completed면 user_message, chatbot_response 포함
+    """
+    job = await get_job(job_id)
+    # 다른 사용자의 작업은 없는 것으로 취급
+    if job is None or job.get("user_id") != str(token_user_id):
+        raise HTTPException(404, "작업을 찾을 수 없습니다.")
+
+    return SttJobResponse(**{k: v for k, v in job.items() if v != ""})
+
+
+@chat_router.websocket("/stream/audio")
+async def chat_audio_stream(websocket: WebSocket, token: str = Query(...)):
+    """
+    실시간 음성 챗봇 (WebSocket, ?token=<JWT>)
+    - 클라이언트 → 서버: 녹음 중인 오디오 청크(바이너리, 16kHz mono PCM), 녹음 종료 시 텍스트 "EOS"
+    - 서버 → 클라이언트 (JSON):
+        {"type": "partial", "text"}  인식 중인 문장
+        {"type": "final", "text"}    발화 끝에서 확정된 문장 → 바로 챗봇 응답 시작
+        {"type": "plan" | "delta" | "done" | "error", ...}  POST /chat/stream 과 같은 응답 이벤트
+    - 한 연결에서 여러 번 말할 수 있고, EOS 후 남은 결과를 보내고 연결을 닫음
+    """
+    try:
+        user_id = decode_user_id(token)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+    await websocket.accept()
+
+    try:
+        upstream = await open_stt_stream()
+    except Exception as e:
+        print(f"[ERROR] 스트리밍 STT 연결 실패: {e}")
+        await websocket.send_json({"type": "error", "status_code": 502, "detail": "음성 인식 서버 연결 실패"})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    async def relay_audio():
+        # 클라이언트 → STT 서버 (EOS 또는 연결 종료 시 STT 서버에 EOS 전달)
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes"):
+                    await upstream.send(message["bytes"])
+                elif message.get("text") == STT_STREAM_EOS:
+                    break
+            await upstream.send(STT_STREAM_EOS)
+        except ConnectionClosed:
+            pass
+
+    relay_task = asyncio.create_task(relay_audio())
+    try:
+        # STT 서버 → 클라이언트 (final이 오면 그 자리에서 챗봇 턴 실행)
+        async for raw in upstream:
+            result = parse_stt_message(raw)
+            if result is None:
+                continue
+            if not result["final"]:
+                await websocket.send_json({"type": "partial", "text": result["text"]})
+                continue
+
+            await websocket.send_json({"type": "final", "text": result["text"]})
+            async for event, data in chatbot_turn_events(user_id, result["text"]):
+                await websocket.send_json({"type": event, **data})
+    except (WebSocketDisconnect, ConnectionClosed):
+        pass
+    finally:
+        relay_task.cancel()
+        await upstream.close()
+
+    if websocket.client_state == WebSocketState.CONNECTED:
+        await websocket.close()
+
+
+async def get_chatbot_response(user_id: str, user_message: str, db: AsyncSession):
+    # 한 번의 GPT 호출로 등록 의사 / 프로그램명 / 말벗·추천 의도를 함께 판단
+    plan = await plan_turn(user_message, db)
+    turn = await prepare_chatbot_turn(user_id, user_message, db, plan)
+
+    chatbot_response = turn["response"]
+    if chatbot_response is None:
+        chatbot_response = await gpt_call_async(
+            turn["system_prompt"], turn["user_prompt"], cache_namespace=turn["cache_namespace"]
         )
 
-        if schedule:
-            response_text = f" '{recommended_program}' 일정이 등록되었습니다!"
-            create_chat_log(db, user_id, user_message, response_text)
-            return response_text
+    await save_chatbot_turn(user_id, user_message, chatbot_response, turn)
+    return chatbot_response
+
+
+async def prepare_chatbot_turn(user_id: str, user_message: str, db: AsyncSession, plan: dict) -> dict:
+    """
+    planner 결과에 따라 마지막 응답 생성(GPT) 직전까지 처리
+    - response: 이미 확정된 응답 (일정 등록), 없으면 None → system_prompt/user_prompt로 생성
+    - recommended_program: 대화 로그에 남길 추천 프로그램명
+    - recommended_record: 추천한 프로그램 레코드 (Redis 대화 상태에 id 기록)
+    """
+    turn = {
+        "plan": plan,
+        "response": None,
+        "system_prompt": None,
+        "user_prompt": None,
+        "cache_namespace": None,
+        "recommended_program": None,
+        "recommended_record": None,
+    }
+
+    # (A) "예", "등록" 등으로 일정 등록 의사 표시
+    if plan["confirm"]:
+        # 1) 최근 추천 프로그램 찾기 (Redis 대화 상태 → 없으면 대화 로그)
+        state = await get_dialog_state(user_id)
+        if state is not None:
+            # 이 추천으로 이미 등록했으면 안됨
+            if not state["pending"]:
+                raise HTTPException(status_code=409, detail="이미 등록된 일정입니다")
+            recommended_program = state["program_name"]
+            program_id = state["program_id"]
         else:
-            raise HTTPException(
-                status_code=500,
-                detail="일정 등록 실패"
-            )
+            # 아직 저장 대기 중인 로그 먼저
+            recommended_program = chat_log_writer.pending_recommended_program(user_id) \
+                or await get_last_recommended_program_by_user_id_async(user_id, db)
+            if not recommended_program:
+                raise HTTPException(
+                    status_code=400,
+                    detail="최근에 추천된 프로그램이 없습니다."
+                )
+
+            # 2) DB에서 해당 프로그램 조회
+            program = await get_program_by_name_async(db, recommended_program)
+            program_id = program.id
+
+        # 3) 일정 생성 (INSERT 한 번, 이미 등록돼 있으면 409)
+        await register_schedule_async(db, int(user_id), program_id)
 
-    # (B) 사용자 메시지에서 프로그램명 추출
-    requested_program = extract_requested_program(user_message)
-    response = {"user_id": user_id}
+        await mark_confirmed(user_id)
+        turn["response"] = f" '{recommended_program}' 일정이 등록되었습니다!"
+        return turn
+
+    # (B) planner가 추출한 프로그램명
+    requested_program = plan["program_keyword"]
 
     # (C-0) 대화 의도가 프로그램 추천과 무관할 경우 → 말벗 모드로 전환
-    if requested_program is None:
-        system_prompt = """
-            다음 문장이 '복지 프로그램 추천을 요청하는 문장'인지 판단해 주세요.
-            만약 추천 관련 요청이 아니고, 감성적인 말벗 대화나 일상적인 고민, 감정 표현이라면 '말벗'이라고만 답해주세요.
-            예) '요즘 다리가 아파요' → 말벗
-            예) '요가 수업 있어요?' → 추천
+    if requested_program is None and plan["intent"] == TURN_INTENT_CHAT:
+        # 감성적 말벗 응답
+        turn["system_prompt"] = """
+            당신은 노인분들의 감정을 따뜻하게 받아주는 말벗입니다.
+            사용자의 문장을 위로하거나 공감하는 따뜻한 한마디로 자연스럽게 응답해 주세요.
+            너무 길지 않고 진심이 느껴지는 문장으로 부모님한테 하는 말처럼 만들어 주세요.
+            예시:
+            - '당신이 아프면 저도 가슴이 아파요.'
+            - '마음이 많이 힘드셨겠어요. 제가 곁에 있을게요.'
+            - '언제든지 편하게 이야기해 주세요. 전 늘 여기 있어요.'
             """
-        intent = gpt_call(system_prompt, user_message, max_tokens=10).strip().lower()
-
-        if "말벗" in intent:
-            # 감성적 말벗 응답
-            system_prompt = """
-                당신은 노인분들의 감정을 따뜻하게 받아주는 말벗입니다.
-                사용자의 문장을 위로하거나 공감하는 따뜻한 한마디로 자연스럽게 응답해 주세요.
-                너무 길지 않고 진심이 느껴지는 문장으로 부모님한테 하는 말처럼 만들어 주세요.
-                예시:
-                - '당신이 아프면 저도 가슴이 아파요.'
-                - '마음이 많이 힘드셨겠어요. 제가 곁에 있을게요.'
-                - '언제든지 편하게 이야기해 주세요. 전 늘 여기 있어요.'
-                """
-            assistant_answer = gpt_call(system_prompt, user_message)
-            response["assistant_answer"] = assistant_answer
-            chatbot_response = assistant_answer
-            create_chat_log(db, user_id, user_message, chatbot_response)
-            return chatbot_response
+        turn["user_prompt"] = user_message
+        return turn
 
     # (C) 프로그램 추천 관련 처리
     if requested_program is None:
         # (C-1) 프로그램명이 언급되지 않았다면 => 무작위 추천
-        # recommend_random_program 함수는 (안내문, 추천된 프로그램명) 두 값을 반환하도록 합니다.
-        raw_msg, found_program_name = recommend_random_program(int(user_id), db)
+        # recommend_random_program 함수는 (안내문, 추천된 프로그램) 두 값을 반환
+        raw_msg, found_program = await recommend_random_program(int(user_id), db)
 
-        system_prompt = (
+        turn["system_prompt"] = (
             "당신은 노인 복지 센터의 비서입니다. 아래 문장을 간단히 다듬어 주세요. "
             "주어진 프로그램 정보를 바탕으로, 친근하고 간결하며 자연스러운 문장으로 이모티콘 없이 추천 메시지를 작성해 주세요. "
             "예시 형식: '서예교실을 추천드릴께요. 창의적이고 감성적인 당신께 잘 어울릴꺼에요...' "
         )
-        recommendation = gpt_call(system_prompt, raw_msg)
-        response["recommendation"] = recommendation
-        chatbot_response = recommendation
+        turn["user_prompt"] = raw_msg
+        turn["cache_namespace"] = "rephrase"
+        # 무작위 추천한 프로그램명을 대화 로그에 기록
+        if found_program:
+            turn["recommended_program"] = found_program.name
+            turn["recommended_record"] = found_program
+        return turn
 
-        # 무작위 추천한 프로그램명을 대화 로그에 기록 (found_program_name가 바로 저장됨)
-        create_chat_log_with_program(db, user_id, user_message, chatbot_response, recommended_program=found_program_name)
-        return chatbot_response
+    # (C-2) 프로그램명이 언급되었다면 => DB 검색 또는 안내 메시지
+    # search_program_and_build_message 함수는 (안내문, 추천된 프로그램) 두 값을 반환
+    raw_msg, found_program = await search_program_and_build_message(db, requested_program)
 
+    # 강제 문자열 변환: 혹시 raw_msg가 예상치 못한 타입일 경우를 대비
+    if not isinstance(raw_msg, str):
+        raw_msg = str(raw_msg)
+
+    turn["user_prompt"] = raw_msg
+    if found_program:
+        turn["system_prompt"] = (
+            "당신은 노인 복지 센터 비서입니다. 친절히 안내해 주세요. "
+            "친근하고 간결하며 자연스러운 문장으로 추천 메시지를 이모티콘 없이 작성해 주세요. "
+            "예시 형식: '네, 마침 SK청솔노인복지관에서 서예교실을 진행합니다...' "
+        )
+        turn["cache_namespace"] = "rephrase"
+        # 특정 프로그램명 언급 시에도 추천된 프로그램명을 대화 로그에 기록
+        turn["recommended_program"] = found_program.name
+        turn["recommended_record"] = found_program
     else:
-        # (C-2) 프로그램명이 언급되었다면 => DB 검색 또는 안내 메시지
-        # search_program_and_build_message 함수는 (안내문, 추천된 프로그램명) 두 값을 반환하도록 합니다.
-        raw_msg, found_program_name = search_program_and_build_message(db, requested_program)
-
-        # 강제 문자열 변환: 혹시 raw_msg가 예상치 못한 타입일 경우를 대비
-        if not isinstance(raw_msg, str):
-            raw_msg = str(raw_msg)
-
-        if found_program_name:
-            system_prompt = (
-                "당신은 노인 복지 센터 비서입니다. 친절히 안내해 주세요. "
-                "친근하고 간결하며 자연스러운 문장으로 추천 메시지를 이모티콘 없이 작성해 주세요. "
-                "예시 형식: '네, 마침 SK청솔노인복지관에서 서예교실을 진행합니다...' "
-            )
-            recommendation = gpt_call(system_prompt, raw_msg)
-            response["recommendation"] = recommendation
-            chatbot_response = recommendation
-            response["recommended_program"] = found_program_name
-
-            # 특정 프로그램명 언급 시에도 추천된 프로그램명을 대화 로그에 기록
-            create_chat_log_with_program(db, user_id, user_message, chatbot_response, recommended_program=found_program_name)
-            return chatbot_response
+        turn["system_prompt"] = (
+            "짧고 부드러운 말투로 안내해 주세요. 죄송하지만 저희가 연계하고 있는 센터에는 "
+            "그 프로그램이 없습니다로 시작해 주세요."
+        )
+        turn["cache_namespace"] = "nonexistent"
+    return turn
+
+
+async def save_chatbot_turn(user_id: str, user_message: str, chatbot_response: str, turn: dict):
+    """
+    대화 로그 저장 (추천된 프로그램이 있으면 함께 기록)
+    - 응답을 기다리게 하지 않도록 write-behind 버퍼에 넣고 백그라운드에서 일괄 INSERT
+    - 추천했으면 Redis 대화 상태에 프로그램 id 기록 (다음 등록 확인 턴용)
+    """
+    chat_log_writer.enqueue(user_id, user_message, chatbot_response, turn["recommended_program"])
+    record = turn["recommended_record"]
+    if record is not None:
+        await save_recommendation(user_id, record.id, record.name)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 
+async def chatbot_turn_events(user_id: str, user_message: str):
+    """
+    챗봇 한 턴을 (이벤트, 데이터) 단위로 생성 (SSE / WebSocket 공용)
+    - plan: planner 결과를 바로 전송
+    - delta: 생성되는 응답 텍스트 조각
+    - done: 전체 응답 (이 시점에 대화 로그 저장)
+    - error: 처리 중 HTTPException (status_code, detail)
+    """
+    # 스트리밍 중에는 요청 의존성(get_async_db)이 이미 정리된 뒤라 세션을 직접 엶
+    async with AsyncSessionLocal() as db:
+        try:
+            plan = await plan_turn(user_message, db)
+            yield "plan", plan
+            turn = await prepare_chatbot_turn(user_id, user_message, db, plan)
+        except HTTPException as e:
+            yield "error", {"status_code": e.status_code, "detail": e.detail}
+            return
+
+        chatbot_response = turn["response"]
+        if chatbot_response is not None:
+            yield "delta", {"text": chatbot_response}
         else:
-            system_prompt = (
-                "짧고 부드러운 말투로 안내해 주세요. 죄송하지만 저희가 연계하고 있는 센터에는 "
-                "그 프로그램이 없습니다로 시작해 주세요."
-            )
-            assistant_answer = gpt_call(system_prompt, raw_msg)
-            response["assistant_answer"] = assistant_answer
-            chatbot_response = assistant_answer
-            # 이 경우 추천된 프로그램명이 없으므로 로그에 저장할 때 생략
-            create_chat_log(db, user_id, user_message, chatbot_response)
-            return chatbot_response
+            parts = []
+            async for delta in gpt_stream_async(
+                turn["system_prompt"], turn["user_prompt"], cache_namespace=turn["cache_namespace"]
+            ):
+                parts.append(delta)
+                yield "delta", {"text": delta}
+            chatbot_response = "".join(parts).strip()
+
+        await save_chatbot_turn(user_id, user_message, chatbot_response, turn)
+        yield "done", {"user_message": user_message, "chatbot_response": chatbot_response}
+
+
+async def stream_chatbot_response(user_id: str, user_message: str):
+    """
+    get_chatbot_response의 SSE 버전 (이벤트 종류는 chatbot_turn_events 참고)
+    """
+    async for event, data in chatbot_turn_events(user_id, user_message):
+        yield _sse(event, data)
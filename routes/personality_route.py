@@ -5,11 +5,12 @@ from importlib.resources import contents
 from fastapi import APIRouter, status
 from fastapi.params import Query, Depends
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.chat_log import get_recent_user_messages
+from crud.chat_log import get_recent_user_messages_async
 from crud.personality import *
-from utils.database import get_db
-from utils.gpt_utils import gpt_call
+from utils.database import get_async_db, get_db
+from utils.gpt_utils import gpt_call_async
 from schemas.personality_schema import AnalyzeResponse, AnalyzeRequest, MBTI
 from utils.jwt_utils import verify_token 
 
@@ -124,10 +125,10 @@ def get_user_mbti(
     )
 
 @personality_router.post("/analysis")
-def reanalyze_mbti(
+async def reanalyze_mbti(
     days: int = Query(30, description="최근 N일간의 데이터를 분석 (기본값: 30일)"),
     token_user_id: str = Depends(verify_token),    # 🔑 JWT → user_id
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     최근 N일 대화내용을 바탕으로 사용자의 성향(MBTI) 변화를 재분석한다.
@@ -155,7 +156,7 @@ def reanalyze_mbti(
         return current if change in (None, "NO_CHANGE") else change
 
     # 1️⃣ 최근 대화 로그
-    logs = get_recent_user_messages(db, token_user_id, days)
+    logs = await get_recent_user_messages_async(db, token_user_id, days)
     if not logs:
         raise HTTPException(404, f"{days}일간 대화 기록이 없어 분석 불가")
 
@@ -170,7 +171,7 @@ def reanalyze_mbti(
     )
     user_prompt = f"최근 {days}일간 사용자 대화:\n{conversation_text}"
 
-    gpt_raw = gpt_call(system_prompt, user_prompt)
+    gpt_raw = await gpt_call_async(system_prompt, user_prompt)
     print("GPT raw >>>", repr(gpt_raw)[:300])
 
     try:
@@ -182,7 +183,7 @@ def reanalyze_mbti(
         )
 
     # 3️⃣ 현재 성향 로드(없으면 최초 분석)
-    current_row = get_latest_personality_by_user_id(db, token_user_id)
+    current_row = await get_latest_personality_by_user_id_async(db, token_user_id)
     if current_row is None:
         current_row = SimpleNamespace(ei=None, sn=None, tf=None, pj=None)
 
@@ -208,7 +209,7 @@ def reanalyze_mbti(
     new_mbti = f"{updated_ei}{updated_sn}{updated_tf}{updated_jp}"
     new_tags = ",".join(analyze_mbti_tags(new_mbti))
 
-    update_latest_personality_by_user_id(
+    await update_latest_personality_by_user_id_async(
         db,
         token_user_id,
         updated_ei,
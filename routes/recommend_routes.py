@@ -1,20 +1,26 @@
+import base64
 import datetime
+import json
+import os
 import random
 
 from fastapi import APIRouter, status, HTTPException
-from fastapi.params import Depends
+from fastapi.params import Depends, Query
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
-from crud.personality import get_latest_personality_by_user_id
-from crud.program import get_program_by_id, get_all_programs
-from crud.schedule import create_schedule, existing_schedule
-from crud.user import get_user_by_id
+from crud.personality import get_latest_personality_by_user_id, get_latest_personality_by_user_id_async
+from crud.program import get_all_programs, get_programs_by_tag_overlap_async
+from crud.schedule import register_schedule_async
 from model.program import Program
 from schemas.program_schema import ProgramSchema
-from schemas.recommend_schema import ScheduleRequest
-from utils.database import get_db
+from schemas.recommend_schema import ScheduleRequest, RecommendPageSchema
+from utils.catalog import ProgramRecord, get_catalog_async, peek_catalog
+from utils.database import get_async_db, get_db
+from utils.json_response import BytesJSONResponse, dumps, json_array, json_object
+from utils.recommend_cache import get_user_matches_async
 from utils.jwt_utils import verify_token 
 
 # 공통 유틸
@@ -22,70 +28,134 @@ def _assert_same_user(url_user_id: int | str, token_user_id: str):
     if str(url_user_id) != str(token_user_id):
         raise HTTPException(403, "토큰과 user_id가 일치하지 않습니다.")
 
+# 태그 매칭 방식: memory(카탈로그 스냅샷) / sql(DB GROUP BY) / auto(스냅샷이 준비돼 있으면 memory)
+RECOMMEND_MATCH_MODE = os.getenv("RECOMMEND_MATCH_MODE", "auto").lower()
+RECOMMEND_MIN_OVERLAP = 2
+RECOMMEND_PROGRAM_FIELDS = set(ProgramSchema.model_fields)
+RECOMMEND_PAGE_SIZE = 20        # cursor만 주고 limit을 생략했을 때
+
+def _encode_cursor(score: int, program_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([score, program_id]).encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple[int, int]:
+    try:
+        score, program_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return int(score), int(program_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 입니다.")
+
+def _parse_fields(fields: str | None) -> set[str] | None:
+    if not fields:
+        return None
+    selected = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = selected - RECOMMEND_PROGRAM_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 필드: {', '.join(sorted(unknown))}")
+    return selected | {"id"}
+
+async def _match_programs(
+    db: AsyncSession,
+    user_id: str,
+    after: tuple[int, int] | None,
+    limit: int | None,
+) -> list[tuple]:
+    """
+    (프로그램, 겹친 태그 수) 목록을 점수 내림차순 → id 오름차순으로, after 다음부터 limit개 (None이면 전부)
+    """
+    mode = RECOMMEND_MATCH_MODE
+    if mode == "auto":
+        mode = "memory" if peek_catalog() is not None else "sql"
+
+    if mode == "sql":
+        personality = await get_latest_personality_by_user_id_async(db, user_id)
+        return await get_programs_by_tag_overlap_async(db, personality.tag_list, RECOMMEND_MIN_OVERLAP, after, limit)
+
+    # memory: 사용자별로 미리 계산해 둔 (program_id, 점수) 목록 + 카탈로그 스냅샷
+    # (프로그램이 하나도 없으면 sql 모드와 같이 빈 목록 → 라우트에서 같은 404)
+    catalog = await get_catalog_async(db)
+    if not catalog.programs:
+        return []
+    ranked = await get_user_matches_async(db, user_id)
+    if after is not None:
+        score, program_id = after
+        ranked = [(pid, s) for pid, s in ranked if s < score or (s == score and pid > program_id)]
+
+    result = []
+    for program_id, score in ranked:
+        program = catalog.by_id.get(program_id)
+        if program is not None:
+            result.append((program, score))
+            if len(result) == limit:
+                break
+    return result
+
 recommend_router = APIRouter()
 
 # 사용자 성향 기반 추천 프로그램 목록
-@recommend_router.get("", response_model=List[ProgramSchema])
-def get_recommend_programs(
+@recommend_router.get("", response_model=RecommendPageSchema | list[ProgramSchema])
+async def get_recommend_programs(
+    limit: Optional[int] = Query(None, ge=1, le=100, description="한 번에 받을 프로그램 수 (주면 페이지 응답)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    fields: Optional[str] = Query(None, description="필요한 필드만 (예: id,name,start_time,end_time)"),
     token_user_id: str = Depends(verify_token),  # JWT → user_id
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     GET /recommend   (Authorization: Bearer <token>)
+    - 겹치는 성향 태그 수가 많은 순(같으면 id 순)으로 정렬
+    - limit/cursor가 없으면 기존처럼 전체 목록을 배열로 반환
+    - limit 또는 cursor를 주면 {items, next_cursor} 페이지로 반환 (limit 기본 20), 다음 페이지는 next_cursor로 조회
+    - fields를 주면 목록 화면에 필요한 필드만 반환 (center/tags 생략 가능)
+    - 카탈로그 프로그램은 로드 시 만들어 둔 JSON을 이어 붙여 응답 (response_model은 문서용)
     """
-    # 1) 사용자 성향 태그
-    personality = get_latest_personality_by_user_id(db, token_user_id)
-    user_tags = str(personality.tag).split(",")
+    after = _decode_cursor(cursor) if cursor else None
+    include = _parse_fields(fields)
+    paged = limit is not None or after is not None
+    if paged and limit is None:
+        limit = RECOMMEND_PAGE_SIZE
 
-    # 2) 프로그램 태그와 교집합 ≥ 2개인 프로그램 필터
-    programs = get_all_programs(db)
-    matched = [
-        p for p in programs
-        if len(set(user_tags) & {t.name for t in p.tags}) >= 2
-    ]
+    # 1~2) 사용자 성향 태그와 교집합 ≥ 2개인 프로그램 (페이지 응답이면 다음 페이지 존재 여부 확인용으로 1개 더)
+    matched = await _match_programs(db, token_user_id, after, limit + 1 if paged else None)
 
     # 3) 결과 반환
-    if not matched:
+    if not matched and after is None:
         return JSONResponse(
             status_code=404,
             content={"message": "사용자 성향에 맞는 프로그램이 없습니다."},
         )
-    return matched
+
+    if not paged:
+        return BytesJSONResponse(json_array(_program_json(program, include) for program, _ in matched))
+
+    page = matched[:limit]
+    next_cursor = _encode_cursor(page[-1][1], page[-1][0].id) if len(matched) > limit else None
+    items = [_program_json(program, include) for program, _ in page]
+    return BytesJSONResponse(json_object(items=json_array(items), next_cursor=dumps(next_cursor)))
+
+def _program_json(program, include: set[str] | None) -> bytes:
+    # 카탈로그 레코드는 미리 인코딩된 JSON, sql 모드의 ORM 객체만 ProgramSchema로 직렬화
+    if isinstance(program, ProgramRecord):
+        return program.to_json(include)
+    return dumps(ProgramSchema.model_validate(program).model_dump(mode="json", include=include))
 
 # 추천 프로그램을 일정으로 저장
 @recommend_router.post("", summary="추천 일정 저장")
-def save_program(
+async def save_program(
     body: ScheduleRequest,                         # 이제 body.user_id는 필요 X
     token_user_id: str = Depends(verify_token),    # JWT → user_id
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     추천된 프로그램을 사용자의 일정으로 등록합니다.
     - 클라이언트는 Bearer 토큰과 program_id만 보내면 됨
     """
 
-    # 이미 등록된 경우 등록 안되게 처리
-    existing = existing_schedule(db, int(token_user_id), body.program_id)
-
-    if existing:
-        raise HTTPException(status_code=409, detail="이미 등록된 일정입니다")
-
-    # 1) 사용자·프로그램 조회
-    user = get_user_by_id(db, token_user_id)
-    program = get_program_by_id(db, body.program_id)
+    # 일정 생성 (INSERT 한 번, 이미 등록된 경우 409 / 프로그램이 없으면 404)
+    await register_schedule_async(db, int(token_user_id), body.program_id)
 
-    # 2) 일정 생성
-    success = create_schedule(db, user, program, program.center)
-
-    # 3) 응답
-    if success:
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={"message": "일정이 저장되었습니다."},
-        )
     return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={"error": "일정 저장에 실패하였습니다."},
+        status_code=status.HTTP_200_OK,
+        content={"message": "일정이 저장되었습니다."},
     )
 
 
@@ -121,8 +191,7 @@ def recommend_random_program(user_id : int, db: Session=Depends(get_db)):
     """
     # 1. 사용자 태그 가져오기
     personality = get_latest_personality_by_user_id(db, user_id)
-    tags = str(personality.tag)
-    user_tags = tags.split(",")
+    user_tags = personality.tag_list
 
     # 2. 프로그램 정보 가져오기
     programs = get_all_programs(db)
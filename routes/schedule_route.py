@@ -1,29 +1,71 @@
-from fastapi import APIRouter
+import os
+
+from fastapi import APIRouter, HTTPException
 from fastapi.params import Depends
 import datetime
 
 from typing import List
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.schedule import get_all_schedules_by_id
+from crud.schedule import get_all_schedules_by_id_async, get_schedule_rows_by_user_id_async
 from schemas.schedule_schema import ScheduleResponseSchema
-from utils.database import get_db
+from utils.catalog import get_catalog_async, peek_catalog
+from utils.database import get_async_db
+from utils.json_response import BytesJSONResponse, dumps, json_array, json_object
 from utils.jwt_utils import verify_token
 
+# program/center 로드 방식: eager(selectin/joined 로드) / catalog(카탈로그 스냅샷) / auto(스냅샷이 준비돼 있으면 catalog)
+SCHEDULE_LOAD_MODE = os.getenv("SCHEDULE_LOAD_MODE", "auto").lower()
+
 schedule_router = APIRouter()
 
 @schedule_router.get("", response_model=List[ScheduleResponseSchema])
-def get_schedule(
+async def get_schedule(
     token_user_id: str = Depends(verify_token),  # JWT → user_id
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     내 일정 목록 조회  
     GET /schedule   (Authorization: Bearer <token>)
     """
-    schedules = get_all_schedules_by_id(db, token_user_id)
-    return schedules
+    mode = SCHEDULE_LOAD_MODE
+    if mode == "auto":
+        mode = "catalog" if peek_catalog() is not None else "eager"
+
+    if mode == "catalog":
+        body = await _schedules_from_catalog(db, token_user_id)
+        if body is not None:
+            return BytesJSONResponse(body)
+
+    return await get_all_schedules_by_id_async(db, token_user_id)
+
+
+async def _schedules_from_catalog(db: AsyncSession, user_id: str) -> bytes | None:
+    """
+    일정 컬럼만 조회(쿼리 1회)하고 program/center는 카탈로그 스냅샷의 JSON으로 채운 응답 본문
+    - 스냅샷에 없는 프로그램/센터가 있으면(새로 추가된 직후 등) None → eager 조회
+    """
+    catalog = await get_catalog_async(db)
+    rows = await get_schedule_rows_by_user_id_async(db, user_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="등록된 스케줄이 없습니다.")
+
+    schedules = []
+    for row in rows:
+        program = catalog.by_id.get(row.program_id)
+        center = catalog.center_by_id.get(row.center_id)
+        if program is None or center is None:
+            return None
+        # ScheduleResponseSchema와 같은 필드 순서
+        schedules.append(json_object(
+            id=dumps(row.id),
+            user_id=dumps(row.user_id),
+            created_at=dumps(row.created_at),
+            program=program.json,
+            center=center.json,
+        ))
+    return json_array(schedules)
 
 
 def save_schedule(user_id, program_name, 요일1, 요일2, 요일3, 요일4, 요일5, 시작시간, 종료시간):
@@ -3,17 +3,20 @@ from redis import Redis
 from fastapi import APIRouter, status, File, UploadFile, Depends, HTTPException
 from fastapi.params import Depends
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from crud.schedule import create_schedule
+from crud.schedule import register_schedule_async
 from schemas.test_schema import ScheduleCreateRequest
-from utils.database import get_db
+from utils.database import get_async_db, get_db
 from utils.gpt_utils import gpt_call
+from utils.llm_cache import get_llm_cache_stats
+from utils.audio_utils import get_audio_stats
+from utils.stt_cache import get_stt_cache_stats
+from utils.chat_log_writer import chat_log_writer
 
-from crud.user import get_user_by_id
-from crud.program import get_program_by_id
-from utils.redis_utils import get_redis_client
+from utils.redis_utils import get_redis_client, get_redis_pool_stats
 from utils.stt_utils import fetch_token_from_return_zero, try_stt
 from utils.jwt_utils import verify_token
 
@@ -58,9 +61,9 @@ def chatbot_test(token_user_id: str = Depends(verify_token)):
         raise HTTPException(status_code=500, detail=f"GPT 호출 실패: {e}")
 
 @test_router.post("/save/schedule")
-def create_schedule_for_test(
+async def create_schedule_for_test(
     request: ScheduleCreateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token_user_id: str = Depends(verify_token),
 ):
     """
@@ -72,11 +75,9 @@ def create_schedule_for_test(
             status_code=status.HTTP_403_FORBIDDEN,
         )
 
-    user = get_user_by_id(db, request.user_id)
-    program = get_program_by_id(db, request.program_id)
-    schedule = create_schedule(db=db, user=user, program=program, center=program.center)
+    schedule_id = await register_schedule_async(db, request.user_id, request.program_id)
 
-    return {"message": "Schedule created successfully", "schedule_id": schedule.id}
+    return {"message": "Schedule created successfully", "schedule_id": schedule_id}
 
 @test_router.get("/redis")
 def test_redis(redis: Redis = Depends(get_redis_client)):
@@ -100,15 +101,14 @@ def test_redis(redis: Redis = Depends(get_redis_client)):
 
 
 @test_router.get("/stt-token")
-def get_stt_token(
-    redis: Redis = Depends(get_redis_client),
+async def get_stt_token(
     token_user_id: str = Depends(verify_token),
 ):
     """
     ReturnZero STT 토큰 요청 (JWT 필요)
     """
     try:
-        token = fetch_token_from_return_zero(redis)
+        token = await fetch_token_from_return_zero()
         return token
     except Exception as e:
         return JSONResponse(
@@ -119,14 +119,53 @@ def get_stt_token(
 @test_router.post("/stt")
 async def transcribe_audio(
     audio_file: UploadFile = File(...),
-    redis: Redis = Depends(get_redis_client),
     token_user_id: str = Depends(verify_token),
 ):
     """
     STT 음성 변환 (JWT 필요)
     """
     try:
-        result = await try_stt(audio_file, redis)
+        result = await try_stt(audio_file)
         return JSONResponse(status_code=200, content=result)
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
\ No newline at end of file
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@test_router.get("/llm-cache")
+def llm_cache_stats(token_user_id: str = Depends(verify_token)):
+    """
+    LLM 응답 캐시 hit/miss 통계 (현재 워커 기준, JWT 필요)
+    """
+    return JSONResponse(status_code=200, content=get_llm_cache_stats())
+
+
+@test_router.get("/audio-stats")
+def audio_stats(token_user_id: str = Depends(verify_token)):
+    """
+    STT 전송 전 오디오 정규화 통계 (절감 바이트 등, 현재 워커 기준, JWT 필요)
+    """
+    return JSONResponse(status_code=200, content=get_audio_stats())
+
+
+@test_router.get("/stt-cache")
+def stt_cache_stats(token_user_id: str = Depends(verify_token)):
+    """
+    STT 전사 결과 캐시 통계 (hit / 동시 요청 합류 / 다른 워커 대기, 현재 워커 기준, JWT 필요)
+    """
+    return JSONResponse(status_code=200, content=get_stt_cache_stats())
+
+
+@test_router.get("/redis/pool")
+def redis_pool_stats(token_user_id: str = Depends(verify_token)):
+    """
+    Redis 커넥션 풀 사용 현황 (현재 워커 기준, JWT 필요)
+    """
+    return JSONResponse(status_code=200, content=get_redis_pool_stats())
+
+
+@test_router.get("/chat-log-writer")
+def chat_log_writer_stats(token_user_id: str = Depends(verify_token)):
+    """
+    대화 로그 write-behind 통계 (저장 대기 / 일괄 INSERT 횟수 / 실패, 현재 워커 기준, JWT 필요)
+    """
+    return JSONResponse(status_code=200, content=chat_log_writer.get_stats())
@@ -1,7 +1,17 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 class ChatbotRequest(BaseModel):
-    message: str
+    message: str = Field(..., max_length=500)  # chat_logs.user_message 컬럼 길이
 
 class ScheduleResponse(BaseModel):
-    schedule: str
\ No newline at end of file
+    schedule: str
+
+class SttJobResponse(BaseModel):
+    job_id: str
+    status: str
+    attempts: int = 0
+    user_message: Optional[str] = None
+    chatbot_response: Optional[str] = None
+    error: Optional[str] = None
@@ -12,4 +12,22 @@ class ChatLogResponse(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ChatLogItem(BaseModel):
+    # 대화 기록 목록용 (필요한 컬럼만)
+    id: int
+    user_message: str
+    assistant_response: str
+    recommended_program: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChatLogPageSchema(BaseModel):
+    items: list[ChatLogItem]
+    # 다음(더 오래된) 페이지 조회용 before_id, 마지막 페이지면 None
+    next_before_id: Optional[int] = None
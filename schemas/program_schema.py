@@ -1,5 +1,5 @@
 from dotenv import load_dotenv
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, field_validator, model_validator
 from datetime import time
 from typing import Optional, List
 
@@ -9,6 +9,9 @@ from schemas.center_schema import CenterSchema
 
 load_dotenv()
 
+# 프로그램 이미지 주소 (인스턴스마다 os.getenv 하지 않도록 모듈 로드 시 한 번 읽음)
+AWS_IMAGE_URL = os.getenv("AWS_IMAGE_URL")
+
 class TagSchema(BaseModel):
     name: str
 
@@ -33,10 +36,15 @@ class ProgramSchema(BaseModel):
     image_url: Optional[str] = None
     center: CenterSchema | None
 
+    @field_validator("tags")
+    @classmethod
+    def sort_tags(cls, tags: list[TagSchema] | None) -> list[TagSchema] | None:
+        # 카탈로그 / DB 조회 경로와 관계없이 같은 순서로 응답하도록 이름순 정렬
+        return sorted(tags, key=lambda tag: tag.name) if tags else tags
+
     @model_validator(mode="after")
     def add_image_url(self) -> "ProgramSchema":
-        base_url = os.getenv("AWS_IMAGE_URL")
-        self.image_url = f"{base_url}/{self.id}.jpg"
+        self.image_url = f"{AWS_IMAGE_URL}/{self.id}.jpg"
         return self
 
     class Config:
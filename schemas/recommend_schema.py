@@ -1,5 +1,11 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 
 class ScheduleRequest(BaseModel):
-    program_id: int
\ No newline at end of file
+    program_id: int
+
+class RecommendPageSchema(BaseModel):
+    # ProgramSchema (fields 파라미터를 주면 해당 필드만)
+    items: list[dict[str, Any]]
+    # 다음 페이지 조회용 커서, 마지막 페이지면 None
+    next_cursor: Optional[str] = None
@@ -0,0 +1,60 @@
+"""
+자주 호출되는 crud 조회의 인덱스 / 쿼리 수 회귀 테스트 (메모리 SQLite 시드)
+
+    python -m pytest tests/test_query_plans.py
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from utils.query_plan import HOT_QUERIES, QUERY_BUDGETS, count_budget_queries, explain_query, full_scans, \
+    pick_sample, seed_sqlite
+
+SEED_CHAT_LOGS = 5000
+
+
+@pytest.fixture(scope="module")
+def loop():
+    # aiosqlite 연결은 만든 이벤트 루프에서만 쓸 수 있으므로 모듈 전체에서 루프 하나 사용
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def engine(loop):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    loop.run_until_complete(seed_sqlite(engine, SEED_CHAT_LOGS))
+    yield engine
+    loop.run_until_complete(engine.dispose())
+
+
+@pytest.fixture(scope="module")
+def sample(loop, engine):
+    async def pick():
+        async with async_sessionmaker(engine)() as db:
+            return await pick_sample(db)
+
+    return loop.run_until_complete(pick())
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(loop, engine, sample, name):
+    async def explain():
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            return await explain_query(db, HOT_QUERIES[name], sample)
+
+    plans = loop.run_until_complete(explain())
+    assert plans, f"{name}: 실행된 SELECT가 없습니다."
+    for statement, plan in plans:
+        assert full_scans("sqlite", plan) == [], f"{name}: {plan}\n{statement}"
+
+
+@pytest.mark.parametrize("name", list(QUERY_BUDGETS))
+def test_query_budget(engine, sample, name):
+    budget = QUERY_BUDGETS[name][2]
+    queries, rows = count_budget_queries(engine, name, sample)
+    assert rows > 0, f"{name}: 결과 행이 없어 N+1을 확인할 수 없습니다."
+    assert queries.count <= budget, "\n".join([f"{name}: {queries.count} queries (budget {budget})"] + queries.statements)
@@ -0,0 +1,247 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# STT 전송 전 오디오 정규화 설정 (환경 변수로 조정 가능)
+STT_AUDIO_NORMALIZE = os.getenv("STT_AUDIO_NORMALIZE", "true").lower() == "true"
+STT_AUDIO_SAMPLE_RATE = int(os.getenv("STT_AUDIO_SAMPLE_RATE", "16000"))
+STT_AUDIO_CODEC = os.getenv("STT_AUDIO_CODEC", "flac").lower()             # flac(ffmpeg 필요) | wav
+STT_AUDIO_WORKERS = int(os.getenv("STT_AUDIO_WORKERS", "2"))                # 정규화 프로세스 수
+STT_TRIM_THRESHOLD_DB = float(os.getenv("STT_TRIM_THRESHOLD_DB", "-40"))    # 이보다 조용한 프레임은 무음(dBFS)
+STT_TRIM_FRAME_MS = int(os.getenv("STT_TRIM_FRAME_MS", "20"))
+STT_TRIM_PADDING_MS = int(os.getenv("STT_TRIM_PADDING_MS", "200"))          # 발화 앞뒤로 남길 여유
+FFMPEG_PATH = os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg")
+FFMPEG_TIMEOUT = float(os.getenv("FFMPEG_TIMEOUT", "20"))
+
+_executor: ProcessPoolExecutor | None = None
+
+# 워커 단위 정규화 통계
+_stats = {
+    "requests": 0,
+    "normalized": 0,        # 정규화 결과를 전송
+    "kept_original": 0,     # 원본이 더 작아서 원본 전송
+    "failed": 0,            # 디코딩 실패 등 → 원본 전송
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "seconds_in": 0.0,
+    "seconds_out": 0.0,
+    "process_seconds": 0.0,
+}
+
+
+class AudioDecodeError(Exception):
+    pass
+
+
+def _ffmpeg(args: list[str], data: bytes) -> bytes:
+    result = subprocess.run(
+        [FFMPEG_PATH, "-hide_banner", "-loglevel", "error", *args],
+        input=data,
+        capture_output=True,
+        timeout=FFMPEG_TIMEOUT,
+    )
+    if result.returncode != 0:
+        raise AudioDecodeError(result.stderr.decode(errors="ignore").strip()[-200:])
+    return result.stdout
+
+
+def _resample(samples: np.ndarray, rate: int) -> np.ndarray:
+    """
+    선형 보간 리샘플링 (다운샘플링 시 비율만큼 이동 평균으로 고주파를 먼저 줄임)
+    """
+    if rate == STT_AUDIO_SAMPLE_RATE:
+        return samples
+    ratio = rate / STT_AUDIO_SAMPLE_RATE
+    width = int(round(ratio))
+    if width > 1:
+        samples = np.convolve(samples, np.ones(width, dtype=np.float32) / width, mode="same")
+    positions = np.arange(int(len(samples) / ratio), dtype=np.float64) * ratio
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def _decode_wav(data: bytes) -> np.ndarray:
+    with wave.open(io.BytesIO(data)) as w:
+        channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+        frames = w.readframes(w.getnframes())
+    if width != 2:
+        raise AudioDecodeError(f"unsupported sample width: {width}")
+    # 다운믹스(mono) → 16kHz
+    samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels).astype(np.float32).mean(axis=1)
+    return _resample(samples, rate)
+
+
+def _decode_ffmpeg(data: bytes) -> np.ndarray:
+    # m4a/mp4는 moov 박스가 끝에 있는 경우가 많아 파이프 대신 임시 파일로 읽음
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(data)
+        f.flush()
+        pcm = _ffmpeg(
+            ["-i", f.name, "-ac", "1", "-ar", str(STT_AUDIO_SAMPLE_RATE), "-f", "s16le", "pipe:1"],
+            b"",
+        )
+    return np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+
+
+def decode_audio(data: bytes) -> np.ndarray:
+    """
+    업로드 파일 → 16kHz mono float32 샘플 (16bit 스케일)
+    - PCM WAV는 표준 라이브러리로, 그 외 형식은 ffmpeg로 디코딩
+    """
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        try:
+            return _decode_wav(data)
+        except (wave.Error, AudioDecodeError):
+            pass
+    if not FFMPEG_PATH:
+        raise AudioDecodeError("ffmpeg가 없어 디코딩할 수 없는 형식입니다.")
+    return _decode_ffmpeg(data)
+
+
+def trim_silence(samples: np.ndarray) -> np.ndarray:
+    """
+    프레임 RMS(dBFS) 기준으로 앞뒤 무음 제거 (발화 앞뒤 STT_TRIM_PADDING_MS는 남김)
+    - 전부 무음이면 그대로 반환
+    """
+    frame = STT_AUDIO_SAMPLE_RATE * STT_TRIM_FRAME_MS // 1000
+    count = len(samples) // frame
+    if count == 0:
+        return samples
+
+    frames = samples[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    db = 20 * np.log10(np.maximum(rms, 1.0) / 32768.0)
+    voiced = np.flatnonzero(db > STT_TRIM_THRESHOLD_DB)
+    if not len(voiced):
+        return samples
+
+    padding = STT_TRIM_PADDING_MS // STT_TRIM_FRAME_MS
+    start = max(int(voiced[0]) - padding, 0) * frame
+    end = min((int(voiced[-1]) + 1 + padding) * frame, len(samples))
+    return samples[start:end]
+
+
+def encode_audio(samples: np.ndarray) -> tuple[bytes, str, str]:
+    """
+    16kHz mono 샘플 → (바이트, 확장자, content_type)
+    """
+    pcm = np.clip(np.round(samples), -32768, 32767).astype("<i2").tobytes()
+    if STT_AUDIO_CODEC == "flac" and FFMPEG_PATH:
+        flac = _ffmpeg(
+            ["-f", "s16le", "-ar", str(STT_AUDIO_SAMPLE_RATE), "-ac", "1", "-i", "pipe:0", "-f", "flac", "pipe:1"],
+            pcm,
+        )
+        return flac, "flac", "audio/flac"
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(STT_AUDIO_SAMPLE_RATE)
+        w.writeframes(pcm)
+    return buffer.getvalue(), "wav", "audio/wav"
+
+
+def normalize_audio(data: bytes) -> tuple[bytes, str, str, float, float]:
+    """
+    디코딩 → mono/16kHz → 앞뒤 무음 제거 → 재인코딩 (프로세스 풀에서 실행)
+    - 반환: (바이트, 확장자, content_type, 원본 길이(초), 결과 길이(초))
+    """
+    samples = decode_audio(data)
+    seconds_in = len(samples) / STT_AUDIO_SAMPLE_RATE
+    samples = trim_silence(samples)
+    encoded, ext, content_type = encode_audio(samples)
+    return encoded, ext, content_type, seconds_in, len(samples) / STT_AUDIO_SAMPLE_RATE
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # 이벤트 루프/스레드가 떠 있는 프로세스를 fork 하지 않도록 spawn 사용
+        _executor = ProcessPoolExecutor(
+            max_workers=STT_AUDIO_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def normalize_for_stt(audio_bytes: bytes, filename: str, content_type: str) -> tuple[bytes, str, str]:
+    """
+    STT 업로드 전 정규화 (CPU 작업은 프로세스 풀에서 처리)
+    - 실패하거나 결과가 원본보다 크면 원본 그대로 반환
+    - 반환: (바이트, 파일명, content_type)
+    """
+    if not STT_AUDIO_NORMALIZE or not audio_bytes:
+        return audio_bytes, filename, content_type
+
+    _stats["requests"] += 1
+    _stats["bytes_in"] += len(audio_bytes)
+    started = time.monotonic()
+    try:
+        loop = asyncio.get_running_loop()
+        encoded, ext, new_type, seconds_in, seconds_out = await loop.run_in_executor(
+            _get_executor(), normalize_audio, audio_bytes
+        )
+    except Exception as e:
+        print(f"[ERROR] 오디오 정규화 실패 (원본 전송): {e!r}")
+        if isinstance(e, BrokenProcessPool):
+            # 자식 프로세스가 죽으면 풀을 버리고 다음 요청에서 새로 만듦
+            shutdown_audio_pool()
+        _stats["failed"] += 1
+        _stats["bytes_out"] += len(audio_bytes)
+        return audio_bytes, filename, content_type
+    finally:
+        _stats["process_seconds"] += time.monotonic() - started
+
+    _stats["seconds_in"] += seconds_in
+    if len(encoded) >= len(audio_bytes):
+        _stats["kept_original"] += 1
+        _stats["seconds_out"] += seconds_in
+        _stats["bytes_out"] += len(audio_bytes)
+        return audio_bytes, filename, content_type
+
+    _stats["normalized"] += 1
+    _stats["seconds_out"] += seconds_out
+    _stats["bytes_out"] += len(encoded)
+    print(
+        f"[INFO] 오디오 정규화: {len(audio_bytes)} → {len(encoded)} bytes, "
+        f"{seconds_in:.1f}s → {seconds_out:.1f}s"
+    )
+    stem = os.path.splitext(filename or "audio")[0]
+    return encoded, f"{stem}.{ext}", new_type
+
+
+def get_audio_stats() -> dict:
+    """
+    워커 단위 정규화 통계 (요청당 평균 절감 바이트 포함)
+    """
+    saved = _stats["bytes_in"] - _stats["bytes_out"]
+    return {
+        **_stats,
+        "bytes_saved": saved,
+        "avg_bytes_saved": round(saved / _stats["requests"]) if _stats["requests"] else 0,
+        "ffmpeg": bool(FFMPEG_PATH),
+        "enabled": STT_AUDIO_NORMALIZE,
+    }
+
+
+def shutdown_audio_pool() -> None:
+    """
+    앱 종료 시 정규화 프로세스 풀 정리
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
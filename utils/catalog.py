@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from model.center import Center
+from model.program import Program, program_tag
+from model.tag import Tag
+from schemas.center_schema import CenterSchema
+from schemas.program_schema import ProgramSchema
+from utils.json_response import dumps
+from utils.redis_utils import get_async_redis, get_redis_client
+from utils.tag_bitset import TagBitsetIndex, encode_tags
+
+load_dotenv()
+
+# 스냅샷 최대 유지 시간(초)과 Redis 버전 키 확인 주기(초)
+CATALOG_TTL = int(os.getenv("CATALOG_TTL", "600"))
+CATALOG_VERSION_CHECK_INTERVAL = int(os.getenv("CATALOG_VERSION_CHECK_INTERVAL", "10"))
+CATALOG_VERSION_KEY = "catalog:version"
+
+
+class CenterRecord:
+    __slots__ = ("id", "name", "latitude", "longitude", "address", "tel", "json")
+
+    def __init__(self, id, name, latitude, longitude, address, tel):
+        self.id = id
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.address = address
+        self.tel = tel
+        # CenterSchema JSON (스냅샷 로드 시 한 번 인코딩)
+        self.json = dumps(CenterSchema.model_validate(self).model_dump(mode="json"))
+
+
+class TagRecord:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class ProgramRecord:
+    """
+    읽기 전용 프로그램 레코드 (ProgramSchema에 from_attributes로 그대로 사용 가능)
+    - data / json: 스냅샷 로드 시 ProgramSchema로 한 번만 직렬화해 둔 dict / JSON bytes (image_url 포함)
+    """
+    __slots__ = (
+        "id", "name", "fir_day", "sec_day", "thr_day", "fou_day", "fiv_day",
+        "start_time", "end_time", "price", "main_category", "sub_category", "headcount",
+        "center_id", "center", "tag_names", "data", "json",
+    )
+
+    def __init__(self, program, center: CenterRecord, tag_names: frozenset[str]):
+        # program: Program 또는 같은 이름의 컬럼을 가진 조회 행
+        self.id = program.id
+        self.name = program.name
+        self.fir_day = program.fir_day
+        self.sec_day = program.sec_day
+        self.thr_day = program.thr_day
+        self.fou_day = program.fou_day
+        self.fiv_day = program.fiv_day
+        self.start_time = program.start_time
+        self.end_time = program.end_time
+        self.price = program.price
+        self.main_category = program.main_category
+        self.sub_category = program.sub_category
+        self.headcount = program.headcount
+        self.center_id = program.center_id
+        self.center = center
+        self.tag_names = tag_names
+        self.data = ProgramSchema.model_validate(self).model_dump(mode="json")
+        self.json = dumps(self.data)
+
+    @property
+    def tags(self) -> list[TagRecord]:
+        return [TagRecord(name) for name in sorted(self.tag_names)]
+
+    def to_json(self, include: set[str] | None = None) -> bytes:
+        """
+        응답용 JSON bytes (include를 주면 해당 필드만, 필드 순서는 ProgramSchema 순서)
+        """
+        if include is None:
+            return self.json
+        return dumps({key: value for key, value in self.data.items() if key in include})
+
+
+class ProgramCatalog:
+    """
+    프로세스 단위로 공유하는 프로그램 카탈로그 스냅샷
+    """
+    __slots__ = ("version", "loaded_at", "fingerprint", "programs", "by_id", "by_name", "center_by_id", "tag_index")
+
+    def __init__(self, version: int, programs: list[ProgramRecord]):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.programs = tuple(programs)
+        self.by_id = {p.id: p for p in self.programs}
+        self.by_name: dict[str, ProgramRecord] = {}
+        for p in self.programs:
+            self.by_name.setdefault(p.name, p)
+        self.center_by_id = {p.center.id: p.center for p in self.programs}
+        self.tag_index = TagBitsetIndex(p.tag_names for p in self.programs)
+        # 프로그램 id + 태그 구성 해시 (TTL로 다시 읽어도 내용이 같으면 같은 값, 워커 간에도 동일)
+        digest = hashlib.blake2b(digest_size=8)
+        for p in self.programs:
+            digest.update(f"{p.id}:{','.join(sorted(p.tag_names))};".encode())
+        self.fingerprint = digest.hexdigest()
+
+    def search(self, keyword: str) -> list[ProgramRecord]:
+        """
+        crud.program.get_program_by_keyword와 같은 조건(이름 부분 일치, 대/중분류 일치)의 메모리 검색
+        """
+        return [
+            p for p in self.programs
+            if keyword in p.name or p.main_category == keyword or p.sub_category == keyword
+        ]
+
+    def match_tags(self, user_tags, min_overlap: int = 2) -> list[ProgramRecord]:
+        """
+        사용자 태그와 min_overlap개 이상 겹치는 프로그램 (카탈로그 순서 유지)
+        """
+        scores = self.tag_index.scores(encode_tags(user_tags))
+        return [self.programs[i] for i in np.flatnonzero(scores >= min_overlap)]
+
+    def rank_tags(self, user_tags, min_overlap: int = 2, top_k: int | None = None) -> list[tuple[ProgramRecord, int]]:
+        """
+        겹치는 태그 수 내림차순(같으면 id 오름차순)으로 정렬한 (프로그램, 점수) 목록
+        """
+        return [
+            (self.programs[i], score)
+            for i, score in self.tag_index.match(encode_tags(user_tags), min_overlap, top_k)
+        ]
+
+
+# 스냅샷용 조회 (ORM 객체 대신 컬럼만 → 행 생성 비용이 작음, N+1 없이 쿼리 3회)
+_PROGRAMS_STMT = select(
+    Program.id, Program.name, Program.fir_day, Program.sec_day, Program.thr_day, Program.fou_day, Program.fiv_day,
+    Program.start_time, Program.end_time, Program.price, Program.main_category, Program.sub_category,
+    Program.headcount, Program.center_id,
+).order_by(Program.id)
+_CENTERS_STMT = select(Center.id, Center.name, Center.latitude, Center.longitude, Center.address, Center.tel)
+_PROGRAM_TAGS_STMT = select(program_tag.c.program_id, Tag.name).join(Tag, Tag.id == program_tag.c.tag_id)
+
+
+def load_catalog(db: Session, version: int = 0) -> ProgramCatalog:
+    """
+    프로그램 + 센터 + 태그를 읽어 스냅샷 생성
+    """
+    return build_catalog(
+        db.execute(_PROGRAMS_STMT).all(),
+        db.execute(_CENTERS_STMT).all(),
+        db.execute(_PROGRAM_TAGS_STMT).all(),
+        version,
+    )
+
+
+async def load_catalog_async(db: AsyncSession, version: int = 0) -> ProgramCatalog:
+    """
+    load_catalog의 async 버전
+    - 조회는 AsyncSession으로, 레코드 생성/JSON 인코딩(CPU 작업)은 스레드풀에서 실행해 이벤트 루프를 막지 않음
+    """
+    programs = (await db.execute(_PROGRAMS_STMT)).all()
+    centers = (await db.execute(_CENTERS_STMT)).all()
+    program_tags = (await db.execute(_PROGRAM_TAGS_STMT)).all()
+    return await run_in_threadpool(build_catalog, programs, centers, program_tags, version)
+
+
+def build_catalog(programs: list, centers: list, program_tags: list, version: int = 0) -> ProgramCatalog:
+    """
+    조회 행으로 스냅샷 생성 (프로그램이 있는 센터만 CenterRecord로 만듦)
+    """
+    center_rows = {c.id: c for c in centers}
+    tag_names: dict[int, set[str]] = {}
+    for program_id, name in program_tags:
+        tag_names.setdefault(program_id, set()).add(name)
+
+    center_records: dict[int, CenterRecord] = {}
+    records = []
+    for program in programs:
+        center = center_records.get(program.center_id)
+        if center is None:
+            c = center_rows[program.center_id]
+            center = CenterRecord(c.id, c.name, c.latitude, c.longitude, c.address, c.tel)
+            center_records[c.id] = center
+        records.append(ProgramRecord(program, center, frozenset(tag_names.get(program.id, ()))))
+
+    return ProgramCatalog(version, records)
+
+
+# ---------- 프로세스 단위 캐시 ---------- #
+_lock = threading.Lock()
+# async 경로용 (한 워커에서 동시에 여러 요청이 다시 읽지 않도록, 스냅샷 교체는 참조 대입이라 두 락이 섞여도 안전)
+_async_lock = asyncio.Lock()
+_catalog: ProgramCatalog | None = None
+_version_checked_at = 0.0
+
+
+def _is_fresh(catalog: ProgramCatalog | None, now: float) -> bool:
+    return catalog is not None and now - catalog.loaded_at < CATALOG_TTL \
+        and now - _version_checked_at < CATALOG_VERSION_CHECK_INTERVAL
+
+
+def _remote_version() -> int | None:
+    try:
+        return int(get_redis_client().get(CATALOG_VERSION_KEY) or 0)
+    except Exception as e:
+        print(f"[ERROR] 카탈로그 버전 조회 실패: {e}")
+        return None
+
+
+async def _remote_version_async() -> int | None:
+    try:
+        return int(await get_async_redis().get(CATALOG_VERSION_KEY) or 0)
+    except Exception as e:
+        print(f"[ERROR] 카탈로그 버전 조회 실패: {e}")
+        return None
+
+
+def _needs_reload(catalog: ProgramCatalog | None, version: int | None, now: float) -> bool:
+    return catalog is None or now - catalog.loaded_at >= CATALOG_TTL \
+        or (version is not None and version != catalog.version)
+
+
+def _next_version(catalog: ProgramCatalog | None, version: int | None) -> int:
+    return version if version is not None else (catalog.version if catalog else 0)
+
+
+def bump_catalog_version() -> int:
+    """
+    프로그램/센터/태그 데이터가 바뀌면 호출 → 모든 워커가 다음 확인 주기에 스냅샷을 다시 읽음
+    """
+    return int(get_redis_client().incr(CATALOG_VERSION_KEY))
+
+
+def peek_catalog() -> ProgramCatalog | None:
+    """
+    DB 접근 없이 현재 메모리에 있는 스냅샷만 반환 (없으면 None)
+    """
+    return _catalog
+
+
+def get_catalog(db: Session) -> ProgramCatalog:
+    """
+    스냅샷 반환. 최초 호출, TTL 만료, Redis 버전 변경 시에만 DB에서 다시 읽음
+    """
+    global _catalog, _version_checked_at
+
+    now = time.monotonic()
+    catalog = _catalog
+    if _is_fresh(catalog, now):
+        return catalog
+
+    with _lock:
+        catalog = _catalog
+        if _is_fresh(catalog, now):
+            return catalog
+
+        version = _remote_version()
+        _version_checked_at = now
+        if not _needs_reload(catalog, version, now):
+            return catalog
+
+        _catalog = load_catalog(db, _next_version(catalog, version))
+        print(f"[INFO] 프로그램 카탈로그 로드: version={_catalog.version}, programs={len(_catalog.programs)}")
+        return _catalog
+
+
+async def get_catalog_async(db: AsyncSession) -> ProgramCatalog:
+    """
+    get_catalog의 async 버전 (AsyncSession + async Redis)
+    - 스냅샷이 유효하면 DB/Redis 접근 없이 바로 반환
+    - 버전 확인은 async Redis, 다시 읽을 때는 load_catalog_async (스냅샷 생성은 스레드풀)
+    """
+    global _catalog, _version_checked_at
+
+    now = time.monotonic()
+    catalog = _catalog
+    if _is_fresh(catalog, now):
+        return catalog
+
+    async with _async_lock:
+        catalog = _catalog
+        if _is_fresh(catalog, now):
+            return catalog
+
+        version = await _remote_version_async()
+        _version_checked_at = now
+        if not _needs_reload(catalog, version, now):
+            return catalog
+
+        _catalog = await load_catalog_async(db, _next_version(catalog, version))
+        print(f"[INFO] 프로그램 카탈로그 로드: version={_catalog.version}, programs={len(_catalog.programs)}")
+        return _catalog
+
+
+def warm_catalog(session_factory) -> None:
+    """
+    앱 시작 시 스냅샷 미리 로드 (실패해도 첫 요청에서 다시 시도)
+    """
+    try:
+        with session_factory() as db:
+            get_catalog(db)
+    except Exception as e:
+        print(f"[ERROR] 카탈로그 초기 로드 실패: {e}")
+
+
+if __name__ == "__main__":
+    # 프로그램/센터/태그 데이터를 직접 바꾼 뒤: python -m utils.catalog --bump
+    parser = argparse.ArgumentParser(description="프로그램 카탈로그 버전 확인 / 갱신")
+    parser.add_argument("--bump", action="store_true", help="버전을 올려 모든 워커가 스냅샷을 다시 읽게 함")
+    args = parser.parse_args()
+
+    if args.bump:
+        print(f"[INFO] 카탈로그 버전 갱신: {bump_catalog_version()}")
+    else:
+        print(f"[INFO] 현재 카탈로그 버전: {_remote_version()}")
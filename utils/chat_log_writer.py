@@ -0,0 +1,189 @@
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from crud.chat_log import insert_chat_logs_async
+from model.chat_log import ChatLog
+from utils.database import AsyncSessionLocal
+
+load_dotenv()
+
+# N개가 모이거나 첫 행이 들어온 뒤 T ms가 지나면 한 번에 INSERT
+CHAT_LOG_BATCH_SIZE = int(os.getenv("CHAT_LOG_BATCH_SIZE", "100"))
+CHAT_LOG_FLUSH_INTERVAL_MS = int(os.getenv("CHAT_LOG_FLUSH_INTERVAL_MS", "200"))
+CHAT_LOG_RETRY_MAX_DELAY = float(os.getenv("CHAT_LOG_RETRY_MAX_DELAY", "5"))       # 저장 실패 시 재시도 최대 대기(초)
+CHAT_LOG_SHUTDOWN_TIMEOUT = float(os.getenv("CHAT_LOG_SHUTDOWN_TIMEOUT", "10"))     # 종료 시 남은 행 저장 대기(초)
+CHAT_LOG_MAX_RETRIES = int(os.getenv("CHAT_LOG_MAX_RETRIES", "10"))                 # 연결 오류로 배치 재시도 최대 횟수
+CHAT_LOG_MAX_PENDING = int(os.getenv("CHAT_LOG_MAX_PENDING", "10000"))              # 버퍼 최대 행 수 (넘으면 새 행 버림)
+
+# 컬럼 길이보다 긴 값은 잘라서 저장 (DataError로 배치 전체가 막히지 않도록)
+_USER_MESSAGE_LEN = ChatLog.__table__.c.user_message.type.length
+_ASSISTANT_RESPONSE_LEN = ChatLog.__table__.c.assistant_response.type.length
+_RECOMMENDED_PROGRAM_LEN = ChatLog.__table__.c.recommended_program.type.length
+
+
+def _clip(value: str | None, length: int) -> str | None:
+    return value[:length] if isinstance(value, str) else value
+
+
+def _is_transient(e: Exception) -> bool:
+    """
+    연결 끊김/타임아웃처럼 같은 배치를 다시 보내면 성공할 수 있는 오류인지
+    (제약 조건 위반, 잘못된 값 등은 다시 보내도 실패)
+    """
+    return isinstance(e, (OperationalError, InterfaceError, OSError, asyncio.TimeoutError))
+
+
+class ChatLogWriter:
+    """
+    대화 로그 write-behind 저장
+    - 요청 경로에서는 메모리 버퍼에 넣기만 하고, 백그라운드 태스크가 모아서 multi-row INSERT
+    - commit이 끝난 행만 버퍼에서 빼므로 연결 오류 시 같은 배치를 다시 저장 (최대 CHAT_LOG_MAX_RETRIES번)
+    - 그 밖의 오류나 재시도 초과 시 한 행씩 저장하고, 그래도 실패한 행은 로그를 남기고 버림
+    - 버퍼가 CHAT_LOG_MAX_PENDING 행을 넘으면 새 행은 버림 (DB 장애 중 메모리 보호)
+    - 아직 저장되지 않은 행은 pending_recommended_program으로 읽을 수 있음 (read-your-writes)
+    - 앱 종료 시 close()로 남은 행 저장
+    """
+
+    def __init__(self):
+        self._pending: deque[dict] = deque()
+        self._not_empty = asyncio.Event()
+        self._batch_ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._stats = {"enqueued": 0, "flushed": 0, "batches": 0, "failures": 0, "dropped": 0}
+
+    def enqueue(
+        self,
+        user_id: str,
+        user_message: str,
+        assistant_response: str | None = None,
+        recommended_program: str | None = None,
+    ) -> None:
+        if len(self._pending) >= CHAT_LOG_MAX_PENDING:
+            # 앞쪽 행은 저장 중일 수 있으므로 새 행을 버림
+            self._stats["dropped"] += 1
+            print(f"[ERROR] 대화 로그 버퍼 가득 참 ({len(self._pending)}건), 버림: user_id={user_id}")
+            return
+
+        now = datetime.now(timezone.utc)
+        self._pending.append({
+            "user_id": int(user_id),
+            "user_message": _clip(user_message, _USER_MESSAGE_LEN),
+            "assistant_response": _clip(assistant_response, _ASSISTANT_RESPONSE_LEN),
+            "recommended_program": _clip(recommended_program, _RECOMMENDED_PROGRAM_LEN),
+            "created_at": now,
+            "updated_at": now,
+        })
+        self._stats["enqueued"] += 1
+        self._not_empty.set()
+        if len(self._pending) >= CHAT_LOG_BATCH_SIZE:
+            self._batch_ready.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def pending_recommended_program(self, user_id: str) -> str | None:
+        """
+        아직 DB에 저장되지 않은 로그 중 이 사용자의 가장 최근 추천 프로그램명
+        """
+        user_id = int(user_id)
+        for row in reversed(self._pending):
+            if row["user_id"] == user_id and row["recommended_program"]:
+                return row["recommended_program"]
+        return None
+
+    async def _run(self) -> None:
+        delay = 0.0
+        retries = 0
+        while not (self._closing and not self._pending):
+            await self._not_empty.wait()
+            if not self._closing and len(self._pending) < CHAT_LOG_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), CHAT_LOG_FLUSH_INTERVAL_MS / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            try:
+                await self._flush_batch()
+                delay = 0.0
+                retries = 0
+            except Exception as e:
+                self._stats["failures"] += 1
+                if _is_transient(e) and retries < CHAT_LOG_MAX_RETRIES:
+                    retries += 1
+                    delay = min(max(delay * 2, 0.1), CHAT_LOG_RETRY_MAX_DELAY)
+                    print(f"[ERROR] 대화 로그 저장 실패 (대기 {len(self._pending)}건, {delay:.1f}초 후 재시도 {retries}/{CHAT_LOG_MAX_RETRIES}): {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                print(f"[ERROR] 대화 로그 배치 저장 실패, 한 행씩 저장: {e}")
+                await self._flush_rows()
+                delay = 0.0
+                retries = 0
+
+    async def _flush_batch(self) -> None:
+        batch = list(islice(self._pending, CHAT_LOG_BATCH_SIZE))
+        if batch:
+            async with AsyncSessionLocal() as db:
+                await insert_chat_logs_async(db, batch)
+            # commit 후에 버퍼에서 제거 (그 사이 들어온 행은 뒤에 붙어 있으므로 앞에서부터 제거)
+            for _ in batch:
+                self._pending.popleft()
+            self._stats["flushed"] += len(batch)
+            self._stats["batches"] += 1
+
+        self._clear_events()
+
+    async def _flush_rows(self) -> None:
+        """
+        배치 저장이 실패했을 때 그 배치를 한 행씩 저장, 실패한 행은 로그를 남기고 버림 (dead letter)
+        """
+        for _ in range(min(CHAT_LOG_BATCH_SIZE, len(self._pending))):
+            row = self._pending[0]
+            try:
+                async with AsyncSessionLocal() as db:
+                    await insert_chat_logs_async(db, [row])
+                self._stats["flushed"] += 1
+            except Exception as e:
+                self._stats["dropped"] += 1
+                print(f"[ERROR] 대화 로그 버림 (user_id={row['user_id']}, created_at={row['created_at'].isoformat()}): {e}")
+            self._pending.popleft()
+
+        self._clear_events()
+
+    def _clear_events(self) -> None:
+        # 남은 행이 없거나 배치 크기보다 적으면 다음 행/타이머를 기다림 (종료 중에는 계속 저장)
+        if not self._closing:
+            if not self._pending:
+                self._not_empty.clear()
+            if len(self._pending) < CHAT_LOG_BATCH_SIZE:
+                self._batch_ready.clear()
+
+    async def close(self) -> None:
+        """
+        앱 종료 시 버퍼에 남은 행 저장 (CHAT_LOG_SHUTDOWN_TIMEOUT 초까지)
+        """
+        self._closing = True
+        self._not_empty.set()
+        self._batch_ready.set()
+        if self._task is None or self._task.done():
+            if not self._pending:
+                return
+            self._task = asyncio.create_task(self._run())
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._task, CHAT_LOG_SHUTDOWN_TIMEOUT)
+            print(f"[INFO] 대화 로그 저장 완료 ({time.monotonic() - started:.2f}초)")
+        except asyncio.TimeoutError:
+            print(f"[ERROR] 종료 전 저장하지 못한 대화 로그: {len(self._pending)}건")
+
+    def get_stats(self) -> dict:
+        return {**self._stats, "pending": len(self._pending)}
+
+
+chat_log_writer = ChatLogWriter()
@@ -1,12 +1,11 @@
+import json
 import random
-from fastapi.params import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.personality import get_latest_personality_by_user_id
-from crud.program import get_program_by_keyword, get_all_programs
-from model.program import Program
-from utils.database import get_db
-from utils.gpt_utils import gpt_call
+from utils.catalog import ProgramRecord, get_catalog_async
+from utils.gpt_utils import gpt_call_async
+from utils.program_matcher import match_program_keyword_async
+from utils.recommend_cache import get_user_matches_async
 
 def fetch_user_personality(user_id):
     """
@@ -38,11 +37,12 @@ def get_course_personality(course_name):
     pass
 
 
-def build_program_message(course_dict: Program):
+def build_program_message(course_dict: ProgramRecord):
     """
     elderly_programs 테이블 한 행(course_dict)에 대해,
     사용자에게 안내할 메시지(문자열)를 만들어 반환.
     필요 없거나 더 필요한 필드는 적절히 추가/삭제하세요.
+    - 반환: (안내문, 추천한 프로그램 레코드)
     """
     message = (
         f"✅ 추천 프로그램이 있습니다!\n\n"
@@ -56,35 +56,28 @@ def build_program_message(course_dict: Program):
         f"금액: {course_dict.price}원\n"
         f"카테고리: {course_dict.main_category} / {course_dict.sub_category}\n"
         f"인원: {course_dict.headcount}\n"
-        f"태그: {course_dict.tags}\n"
+        f"태그: {', '.join(sorted(course_dict.tag_names))}\n"
     )
-    return message, course_dict.name
+    return message, course_dict
 
 
-def recommend_random_program(user_id: int, db:Session=Depends(get_db)):
+async def recommend_random_program(user_id: int, db: AsyncSession):
     """
     - user_personality 테이블에서 personality_tags 가져옴
     - elderly_programs 테이블의 tags와 교집합이 2개 이상인 프로그램 중 무작위 추천
     - 없으면 에러 메시지 반환
     - 있으면 build_program_message로 메시지 생성 후 반환
     """
-    # 1. 사용자 태그 가져오기
-    personality = get_latest_personality_by_user_id(db, user_id)
-    user_tags = [tag.strip() for tag in str(personality.tag).split(",") if tag.strip()]
-
-    # 2. 모든 프로그램 정보 가져오기
-    programs = get_all_programs(db)
-
-    # 3. 사용자 태그와 비교하여 교집합이 2개 이상이면 추천 후보에 추가
-    matched_list = []
-    for program in programs:
-        program_tag_names = [tag.name for tag in program.tags]
-        overlap = set(user_tags) & set(program_tag_names)
-        if len(overlap) >= 2:
-            matched_list.append(program)
+    # 1~3. 사용자 태그와 교집합이 2개 이상인 프로그램 (사용자별 추천 캐시 + 메모리 카탈로그)
+    catalog = await get_catalog_async(db)
+    matched_list = [
+        catalog.by_id[program_id]
+        for program_id, _ in await get_user_matches_async(db, user_id)
+        if program_id in catalog.by_id
+    ]
 
     if not matched_list:
-        return "사용자 성향에 맞는 프로그램이 없습니다."
+        return "사용자 성향에 맞는 프로그램이 없습니다.", None
 
     # 4) 무작위 선택 & 메시지 생성
     chosen = random.choice(matched_list)
@@ -99,24 +92,24 @@ def search_program_in_db(keyword):
     pass
 
 
-def search_program_and_build_message(db:Session, program_keyword):
+async def search_program_and_build_message(db: AsyncSession, program_keyword):
     """
     특정 프로그램명을 검색해서:
     - 찾으면 무작위로 1개 선택 후 build_program_message()
     - 없으면 generate_nonexistent_program_info() 결과 반환
     실제 라우트에서 편하게 쓰기 위해 만든 함수
     """
-    results = get_program_by_keyword(db, program_keyword)
+    results = (await get_catalog_async(db)).search(program_keyword)
     if results:
         chosen = random.choice(results)
-        return build_program_message(chosen), chosen.name
+        return build_program_message(chosen)
     else:
-        alt_info = generate_nonexistent_program_info(program_keyword)
+        alt_info = await generate_nonexistent_program_info(program_keyword)
         # alt_info는 "현재 센터에는 없지만, 이런 프로그램이 있을 수 있다" 등의 문구
         return alt_info, None
 
 
-def generate_nonexistent_program_info(keyword):
+async def generate_nonexistent_program_info(keyword):
     """
     GPT를 통해 "DB엔 없지만 사회적으로 존재하는 프로그램" 안내 문구 생성
     """
@@ -130,21 +123,88 @@ def generate_nonexistent_program_info(keyword):
         f"지금 DB에는 '{keyword}' 관련 프로그램이 없어요. "
         f"하지만 일반적으로 이런 프로그램이 있을 수 있다고 설명해 주세요."
     )
-    return gpt_call(system_prompt, user_prompt)
+    return await gpt_call_async(system_prompt, user_prompt, cache_namespace="nonexistent")
+
+
+# 일정 등록 의사 표시로 보는 메시지 (GPT 호출 없이 바로 판단)
+CONFIRM_MESSAGES = ["예", "네", "등록", "등록할래요"]
+
+TURN_INTENT_CONFIRM = "등록"
+TURN_INTENT_CHAT = "말벗"
+TURN_INTENT_RECOMMEND = "추천"
 
+TURN_PLANNER_PROMPT = """
+사용자 메시지를 분석해 아래 JSON 객체 하나로만 답하세요.
+{"intent": "말벗" | "추천" | "등록", "program_keyword": "요가" 또는 null, "confirm": true | false}
 
-def extract_requested_program(user_message):
+1) program_keyword: 메시지에 특정 프로그램명이 있으면 정확히 한 단어 또는 두 단어로 추출하고, 명확히 언급되지 않았다면 null
+   예) '요가 프로그램이 있나요?' -> "요가"
+2) intent: 복지 프로그램 추천을 요청하는 문장이면 "추천",
+   추천 관련 요청이 아니고 감성적인 말벗 대화나 일상적인 고민, 감정 표현이라면 "말벗",
+   직전에 추천받은 프로그램을 일정으로 등록하겠다는 대답이면 "등록"
+   예) '요즘 다리가 아파요' -> "말벗"
+   예) '요가 수업 있어요?' -> "추천"
+   예) '네 그걸로 등록해 주세요' -> "등록"
+3) confirm: intent가 "등록"이면 true, 아니면 false
+"""
+
+
+def _normalize_plan(raw: dict) -> dict:
     """
-    GPT를 사용해 사용자 메시지에서 '프로그램명' 추출 (1~2단어).
-    없으면 None 반환
+    planner 응답을 {intent, program_keyword, confirm} 형태로 정리
     """
-    system_prompt = """
-    사용자 메시지에서 특정 프로그램명을 정확히 한 단어 또는 두 단어로 추출해 주세요.
-    예) '요가 프로그램이 있나요?' -> '요가'
-    만약 프로그램명이 명확히 언급되지 않았다면 데이터형 'None'만 반환하세요.
+    intent = str(raw.get("intent") or "").strip()
+    keyword = raw.get("program_keyword")
+    confirm = raw.get("confirm") is True or intent == TURN_INTENT_CONFIRM
+
+    if isinstance(keyword, str):
+        keyword = keyword.strip().strip("'\"")
+        if not keyword or keyword.lower() in ("none", "null"):
+            keyword = None
+    else:
+        keyword = None
+
+    if confirm:
+        intent = TURN_INTENT_CONFIRM
+    elif intent not in (TURN_INTENT_CHAT, TURN_INTENT_RECOMMEND):
+        # 알 수 없는 의도: 프로그램명이 있으면 추천, 없으면 말벗으로 처리
+        intent = TURN_INTENT_RECOMMEND if keyword else TURN_INTENT_CHAT
+
+    return {"intent": intent, "program_keyword": keyword, "confirm": confirm}
+
+
+async def plan_turn(user_message: str, db: AsyncSession | None = None) -> dict:
+    """
+    한 번의 GPT 호출로 대화 턴의 처리 방향을 결정
+    - 기존 '예/네/등록' 체크, 프로그램명 추출, 말벗/추천 의도 분류를 하나로 합침
+    - db가 주어지면 프로그램명/별칭 사전에 모호하지 않게 걸리는 짧은 문장은 GPT 없이 바로 '추천'으로 처리
+      (카테고리 단어만 있는 문장은 planner가 말벗/추천을 판단)
+    - 반환: {"intent": "등록"|"말벗"|"추천", "program_keyword": str | None, "confirm": bool}
     """
-    candidate_program = gpt_call(system_prompt, user_message, max_tokens=20)
+    if user_message.strip().lower() in CONFIRM_MESSAGES:
+        return {"intent": TURN_INTENT_CONFIRM, "program_keyword": None, "confirm": True}
+
+    if db is not None:
+        keyword = await match_program_keyword_async(db, user_message)
+        if keyword:
+            return {"intent": TURN_INTENT_RECOMMEND, "program_keyword": keyword, "confirm": False}
+
+    raw = await gpt_call_async(
+        TURN_PLANNER_PROMPT,
+        user_message,
+        max_tokens=60,
+        timeout=10,
+        json_mode=True,
+        temperature=0,
+        cache_namespace="plan",
+    )
+
+    try:
+        plan = json.loads(raw)
+        if not isinstance(plan, dict):
+            raise ValueError("planner 응답이 JSON 객체가 아닙니다.")
+    except ValueError as e:
+        print(f"[ERROR] turn planner 파싱 실패: {e}")
+        plan = {}
 
-    if "none" in candidate_program.lower():
-        return None
-    return candidate_program.strip()
+    return _normalize_plan(plan)
@@ -1,9 +1,12 @@
 import os
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 
 load_dotenv()
@@ -14,11 +17,64 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 DB_PORT = os.getenv("DB_PORT")
 
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# 로컬 테스트용으로 DATABASE_URL을 직접 줄 수 있음 (예: sqlite:///./local.db)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL, echo=True, pool_pre_ping=True)
+# 커넥션 풀 설정 (sync/async 엔진 각각에 적용, 워커 단위)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))        # MySQL wait_timeout보다 짧게(초)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))        # 풀이 가득 찼을 때 대기(초)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"          # 운영에서는 끔
+
+# 동기 드라이버 → 비동기 드라이버
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+
+def _engine_kwargs(url: str) -> dict:
+    kwargs = {"echo": DB_ECHO}
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite는 풀 크기 설정이 의미 없음
+        kwargs["connect_args"] = {"check_same_thread": False}
+        return kwargs
+    kwargs.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return kwargs
+
+
+# SQLite에서도 BigInteger PK가 자동 증가하도록 INTEGER로 생성
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
+
+engine = create_engine(DATABASE_URL, **_engine_kwargs(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 이벤트 루프에서 바로 쓰는 비동기 엔진 (aiomysql / aiosqlite)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_kwargs(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 Base = declarative_base()
 
 # 의존성 주입용
@@ -27,4 +83,18 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# 의존성 주입용 (async 라우트)
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def close_db_engines() -> None:
+    """
+    앱 종료 시 풀의 모든 커넥션 정리
+    """
+    await async_engine.dispose()
+    engine.dispose()
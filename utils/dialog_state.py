@@ -0,0 +1,61 @@
+import os
+
+from dotenv import load_dotenv
+
+from utils.redis_utils import get_async_redis
+
+load_dotenv()
+
+# 사용자별 대화 상태 (마지막 추천 프로그램 + 등록 확인 대기 여부)
+DIALOG_STATE_PREFIX = "dialog:"
+DIALOG_STATE_TTL = int(os.getenv("DIALOG_STATE_TTL", str(60 * 60)))     # 추천 후 등록 확인을 기다리는 시간(초)
+
+
+def _key(user_id) -> str:
+    return f"{DIALOG_STATE_PREFIX}{user_id}"
+
+
+async def save_recommendation(user_id, program_id: int, program_name: str) -> None:
+    """
+    프로그램을 추천했을 때 기록 → 다음 "예/네/등록" 턴에서 DB 조회 없이 바로 일정 등록
+    """
+    try:
+        async with get_async_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(_key(user_id), mapping={
+                "program_id": program_id,
+                "program_name": program_name,
+                "pending": 1,
+            })
+            pipe.expire(_key(user_id), DIALOG_STATE_TTL)
+            await pipe.execute()
+    except Exception as e:
+        # 없으면 확인 턴에서 대화 로그를 조회하므로 실패해도 진행
+        print(f"[ERROR] 대화 상태 저장 실패: {e}")
+
+
+async def get_dialog_state(user_id) -> dict | None:
+    """
+    {"program_id", "program_name", "pending"} (없거나 Redis 오류면 None)
+    """
+    try:
+        state = await get_async_redis().hgetall(_key(user_id))
+    except Exception as e:
+        print(f"[ERROR] 대화 상태 조회 실패: {e}")
+        return None
+    if not state or not state.get("program_id"):
+        return None
+    return {
+        "program_id": int(state["program_id"]),
+        "program_name": state.get("program_name", ""),
+        "pending": state.get("pending") == "1",
+    }
+
+
+async def mark_confirmed(user_id) -> None:
+    """
+    일정 등록 후 확인 대기 해제 (같은 추천에 다시 "네"라고 하면 이미 등록된 일정으로 응답)
+    """
+    try:
+        await get_async_redis().hset(_key(user_id), "pending", 0)
+    except Exception as e:
+        print(f"[ERROR] 대화 상태 갱신 실패: {e}")
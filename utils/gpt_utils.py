@@ -1,20 +1,62 @@
+import asyncio
 import os
+import time
+from typing import AsyncIterator
+
+import httpx
 import openai
 from dotenv import load_dotenv
 
+from utils.llm_cache import LLM_CACHE_ENABLED, get_ttl, make_cache_key, get_cached, set_cached
+
 load_dotenv()
 
 # OpenAI API 키 설정
 openai.api_key = os.getenv("OPENAI_API_KEY")
-client = openai.OpenAI(api_key=openai.api_key)
+
+# 호출/커넥션 풀 설정 (환경 변수로 조정 가능)
+GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o")
+GPT_TIMEOUT = float(os.getenv("GPT_TIMEOUT", "20"))                  # 호출 1건당 타임아웃(초)
+GPT_CONNECT_TIMEOUT = float(os.getenv("GPT_CONNECT_TIMEOUT", "5"))
+GPT_MAX_RETRIES = int(os.getenv("GPT_MAX_RETRIES", "1"))
+GPT_MAX_CONNECTIONS = int(os.getenv("GPT_MAX_CONNECTIONS", "50"))     # 워커당 최대 커넥션 수
+GPT_MAX_KEEPALIVE = int(os.getenv("GPT_MAX_KEEPALIVE", "20"))
+GPT_MAX_CONCURRENCY = int(os.getenv("GPT_MAX_CONCURRENCY", "32"))     # 워커당 동시 GPT 호출 수
+
+GPT_FALLBACK_MESSAGE = "죄송합니다. 다시 말씀해 주세요."
+
+client = openai.OpenAI(
+    api_key=openai.api_key,
+    timeout=httpx.Timeout(GPT_TIMEOUT, connect=GPT_CONNECT_TIMEOUT),
+    max_retries=GPT_MAX_RETRIES,
+)
+
+# 비동기 클라이언트: 하나의 httpx.AsyncClient(커넥션 풀)를 워커 전체에서 공유
+async_client = openai.AsyncOpenAI(
+    api_key=openai.api_key,
+    timeout=httpx.Timeout(GPT_TIMEOUT, connect=GPT_CONNECT_TIMEOUT),
+    max_retries=GPT_MAX_RETRIES,
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=GPT_MAX_CONNECTIONS,
+            max_keepalive_connections=GPT_MAX_KEEPALIVE,
+        ),
+        timeout=httpx.Timeout(GPT_TIMEOUT, connect=GPT_CONNECT_TIMEOUT),
+    ),
+)
+
+# 느린 응답 하나가 워커 전체를 붙잡지 않도록 동시 호출 수 제한
+_gpt_semaphore = asyncio.Semaphore(GPT_MAX_CONCURRENCY)
+
 
 def gpt_call(system_prompt, user_prompt, max_tokens=200):
     """
-    OpenAI 1.0.0 이상 버전에 맞춘 GPT 호출 함수
+    OpenAI 1.0.0 이상 버전에 맞춘 GPT 호출 함수 (동기)
+    - 비동기 라우트에서는 gpt_call_async를 사용하세요.
     """
     try:
         response = client.chat.completions.create(
-            model="gpt-4o",
+            model=GPT_MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -25,4 +67,115 @@ def gpt_call(system_prompt, user_prompt, max_tokens=200):
         return response.choices[0].message.content.strip()
     except Exception as e:
         print(f"[ERROR] GPT 호출 실패: {e}")
-        return "죄송합니다. 다시 말씀해 주세요."
\ No newline at end of file
+        return GPT_FALLBACK_MESSAGE
+
+
+async def gpt_call_async(
+    system_prompt,
+    user_prompt,
+    max_tokens=200,
+    timeout: float | None = None,
+    json_mode: bool = False,
+    temperature: float = 0.7,
+    cache_namespace: str | None = None,
+):
+    """
+    이벤트 루프를 막지 않는 GPT 호출 함수
+    - 공유 커넥션 풀 + 전역 세마포어로 동시 호출 수 제한
+    - timeout: 호출별 타임아웃(초), 없으면 GPT_TIMEOUT 사용
+    - json_mode: True면 JSON 객체만 반환하도록 강제 (response_format=json_object)
+    - temperature: 분류/추출처럼 결정적인 호출은 0 사용
+    - cache_namespace: 지정하면 Redis 응답 캐시 사용 (TTL은 llm_cache.LLM_CACHE_TTLS), None이면 캐시 안 함
+    """
+    ttl = get_ttl(cache_namespace) if (cache_namespace and LLM_CACHE_ENABLED) else 0
+    cache_key = None
+    if ttl > 0:
+        cache_key = make_cache_key(GPT_MODEL, system_prompt, user_prompt, max_tokens, temperature, json_mode)
+        cached = await get_cached(cache_key, cache_namespace)
+        if cached is not None:
+            return cached
+
+    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+    try:
+        started = time.perf_counter()
+        async with _gpt_semaphore:
+            response = await async_client.chat.completions.create(
+                model=GPT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout or GPT_TIMEOUT,
+                **extra,
+            )
+        result = response.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"[ERROR] GPT 호출 실패: {e}")
+        return GPT_FALLBACK_MESSAGE
+
+    if cache_key:
+        await set_cached(cache_key, result, ttl, cache_namespace, elapsed=time.perf_counter() - started)
+    return result
+
+
+async def gpt_stream_async(
+    system_prompt,
+    user_prompt,
+    max_tokens=200,
+    timeout: float | None = None,
+    temperature: float = 0.7,
+    cache_namespace: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    gpt_call_async의 스트리밍 버전: 생성되는 텍스트 조각을 순서대로 yield
+    - 캐시 hit이면 캐시된 전체 문장을 한 번에 yield
+    - 스트림이 끝까지 완료된 경우에만 캐시에 저장
+    """
+    ttl = get_ttl(cache_namespace) if (cache_namespace and LLM_CACHE_ENABLED) else 0
+    cache_key = None
+    if ttl > 0:
+        cache_key = make_cache_key(GPT_MODEL, system_prompt, user_prompt, max_tokens, temperature)
+        cached = await get_cached(cache_key, cache_namespace)
+        if cached is not None:
+            yield cached
+            return
+
+    parts = []
+    started = time.perf_counter()
+    try:
+        async with _gpt_semaphore:
+            stream = await async_client.chat.completions.create(
+                model=GPT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout or GPT_TIMEOUT,
+                stream=True,
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+    except Exception as e:
+        print(f"[ERROR] GPT 스트리밍 실패: {e}")
+        if not parts:
+            yield GPT_FALLBACK_MESSAGE
+        return
+
+    if cache_key and parts:
+        await set_cached(cache_key, "".join(parts).strip(), ttl, cache_namespace, elapsed=time.perf_counter() - started)
+
+
+async def close_gpt_client():
+    """
+    앱 종료 시 공유 커넥션 풀 정리
+    """
+    await async_client.close()
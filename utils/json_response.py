@@ -0,0 +1,34 @@
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class BytesJSONResponse(ORJSONResponse):
+    """
+    이미 인코딩된 JSON bytes는 그대로 내보내는 응답 (그 외 값은 orjson으로 인코딩)
+    - 라우트에서 Response를 직접 반환하므로 response_model 검증/직렬화를 거치지 않음 (문서용으로만 남김)
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    orjson 인코딩 (UTC datetime은 pydantic과 같이 "Z"로 표기)
+    """
+    return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def json_object(**members: bytes) -> bytes:
+    """
+    값이 이미 JSON bytes인 객체 조립 (키 순서 유지)
+    """
+    return b"{" + b",".join(dumps(key) + b":" + value for key, value in members.items()) + b"}"
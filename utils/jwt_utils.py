@@ -12,14 +12,10 @@ SECRET_KEY = os.getenv("JWT_SECRET")      # ❗기본값 제거
 ALGORITHM  = os.getenv("JWT_ALGORITHM")
 ISSUER     = os.getenv("JWT_ISSUER")
 
-def verify_token(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
-) -> str:
+def decode_user_id(token: str) -> str:
     """
-    - Swagger 의 전역 Authorize 로 입력한 Bearer 토큰을 자동 주입받음
-    - 검증 통과 시 payload['sub'](user_id) 리턴
+    JWT 검증 후 payload['sub'](user_id) 리턴 (실패 시 401 HTTPException)
     """
-    token = credentials.credentials
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
@@ -31,7 +27,16 @@ def verify_token(
             raise HTTPException(status_code=401, detail="user_id(sub) 누락")
         return user_id
 
-    except jwt.ExpiredSignatureError:
+    except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.InvalidTokenError:
+    except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+def verify_token(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> str:
+    """
+    - Swagger 의 전역 Authorize 로 입력한 Bearer 토큰을 자동 주입받음
+    - 검증 통과 시 payload['sub'](user_id) 리턴
+    """
+    return decode_user_id(credentials.credentials)
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+
+from dotenv import load_dotenv
+
+from utils.redis_utils import get_async_redis
+
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PREFIX = "llm:cache:"
+LLM_CACHE_DEFAULT_TTL = int(os.getenv("LLM_CACHE_DEFAULT_TTL", str(60 * 60)))
+
+# 호출 지점(namespace)별 TTL(초). LLM_CACHE_TTL_<NAMESPACE> 환경 변수로 덮어쓸 수 있고 0이면 캐시 안 함
+LLM_CACHE_TTLS = {
+    "plan": 60 * 60 * 24,          # 턴 planner (temperature 0)
+    "nonexistent": 60 * 60 * 24,   # DB에 없는 프로그램 안내
+    "rephrase": 60 * 60 * 6,       # build_program_message 문장 다듬기
+}
+
+# 워커 단위 캐시 통계
+_stats: dict[str, dict[str, float]] = {}
+
+
+def _bump(namespace: str, field: str, amount: float = 1) -> None:
+    counters = _stats.setdefault(namespace, {"hit": 0, "miss": 0, "error": 0, "miss_seconds": 0.0})
+    counters[field] += amount
+
+
+def get_ttl(namespace: str) -> int:
+    """
+    namespace별 TTL 조회 (환경 변수 > 기본 테이블 > LLM_CACHE_DEFAULT_TTL)
+    """
+    env_ttl = os.getenv(f"LLM_CACHE_TTL_{namespace.upper()}")
+    if env_ttl is not None:
+        return int(env_ttl)
+    return LLM_CACHE_TTLS.get(namespace, LLM_CACHE_DEFAULT_TTL)
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    공백/대소문자 차이만 있는 프롬프트가 같은 키를 갖도록 정규화
+    """
+    return " ".join(str(text).split()).lower()
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int,
+    temperature: float,
+    json_mode: bool = False,
+) -> str:
+    payload = json.dumps(
+        [model, normalize_prompt(system_prompt), normalize_prompt(user_prompt), max_tokens, temperature, json_mode],
+        ensure_ascii=False,
+    )
+    return LLM_CACHE_PREFIX + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_cached(key: str, namespace: str) -> str | None:
+    """
+    캐시 조회. Redis 장애 시에는 캐시 미스로 처리
+    """
+    try:
+        value = await get_async_redis().get(key)
+    except Exception as e:
+        print(f"[ERROR] LLM 캐시 조회 실패: {e}")
+        _bump(namespace, "error")
+        return None
+
+    _bump(namespace, "hit" if value is not None else "miss")
+    return value
+
+
+async def set_cached(key: str, value: str, ttl: int, namespace: str, elapsed: float | None = None) -> None:
+    if elapsed is not None:
+        _bump(namespace, "miss_seconds", elapsed)
+    try:
+        await get_async_redis().setex(key, ttl, value)
+    except Exception as e:
+        print(f"[ERROR] LLM 캐시 저장 실패: {e}")
+        _bump(namespace, "error")
+
+
+def get_llm_cache_stats() -> dict:
+    """
+    namespace별 hit/miss 수와 hit rate, 절약한 것으로 추정되는 GPT 대기 시간(초)
+    (현재 워커 기준)
+    """
+    result = {}
+    for namespace, c in _stats.items():
+        lookups = c["hit"] + c["miss"]
+        avg_miss = c["miss_seconds"] / c["miss"] if c["miss"] else 0.0
+        result[namespace] = {
+            "hit": int(c["hit"]),
+            "miss": int(c["miss"]),
+            "error": int(c["error"]),
+            "hit_rate": round(c["hit"] / lookups, 4) if lookups else 0.0,
+            "avg_miss_seconds": round(avg_miss, 3),
+            "saved_seconds": round(avg_miss * c["hit"], 3),
+        }
+    return result
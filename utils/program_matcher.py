@@ -0,0 +1,319 @@
+import argparse
+import csv
+import os
+import re
+import sys
+import threading
+from collections import deque
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from utils.catalog import ProgramCatalog, get_catalog, get_catalog_async
+
+load_dotenv()
+
+# 이 길이를 넘는 긴 문장은 감정 표현일 가능성이 높아 GPT planner에 맡김
+PROGRAM_MATCHER_MAX_MESSAGE_LEN = int(os.getenv("PROGRAM_MATCHER_MAX_MESSAGE_LEN", "30"))
+
+# 사용자가 흔히 쓰는 표현 → DB 검색 키워드
+PROGRAM_ALIASES = {
+    "붓글씨": "서예",
+    "캘리": "캘리그라피",
+    "핸드폰": "스마트폰",
+    "휴대폰": "스마트폰",
+    "휴대전화": "스마트폰",
+    "노래방": "노래",
+    "그림": "미술",
+    "줌바": "줌바댄스",
+}
+
+# 프로그램명에서 떼어낼 수준/반 표기와 키워드로 쓰기엔 너무 일반적인 단어
+_LEVEL_WORDS = {"초급", "중급", "고급", "입문", "기초", "심화", "자율", "자율반", "자율심화", "대회", "반", "교실"}
+_STOP_WORDS = {
+    "시니어", "실버", "실전", "시작", "왕초보", "첫걸음", "활용", "필수", "정복", "원어민", "작품",
+    "월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일", "토요", "월수", "화목",
+    # 일상 대화에 흔히 나와 말벗 대화를 추천으로 오인하게 만드는 단어
+    "한마디", "바꾼", "해피", "뷰티풀", "문화", "웃음", "힐링", "모델", "동서양", "클래식", "연필",
+    "회화", "스포츠", "동영상", "역사", "로빅",
+}
+# '배우는', '건강한', '영화로' 같은 수식어와 '배우기' 같은 명사형은 키워드에서 제외
+_MODIFIER_ENDINGS = ("는", "한", "로", "운", "쁜", "기")
+# '역사를', '피아노와', '사진편집과' → 조사 떼기
+_PARTICLES = ("을", "를", "와", "과", "의")
+_HANGUL = re.compile("[가-힣]")
+
+# 키워드 뒤에 붙어도 같은 어절로 보는 조사 / 접미 ('요가를', '요가교실이', '서예하는')
+_JOSA = {
+    "", "은", "는", "이", "가", "을", "를", "도", "만", "요", "이요", "은요", "는요", "도요",
+    "랑", "이랑", "하고", "와", "과", "에", "에서", "으로", "로", "이나", "나", "같은거", "같은",
+}
+_WORD_SUFFIXES = ("", "반", "교실", "수업", "강좌", "프로그램", "하는", "할", "하기", "하러", "배우는", "배울")
+# 추천 요청으로 보는 표현 (공백 제거 후 비교). 없으면 진술/하소연일 수 있으므로 planner가 판단
+_REQUEST_CUES = (
+    "있나요", "있어요?", "있을까", "있는지", "있니", "없나요", "없어요?", "알려", "추천", "찾아", "소개",
+    "배우고싶", "배울수", "배울만", "하고싶", "해보고싶", "어디서", "어디에서", "할수있", "할만한", "신청",
+)
+# 고장/통증/불평 같은 하소연 표현이 있으면 요청 표현이 있어도 planner에 맡김
+_COMPLAINT_CUES = ("고장", "안켜", "안돼", "아파", "아프", "힘들", "어려워", "싫", "못하", "속상", "짜증")
+_TRAILING_MARK = re.compile(r"[A-Za-z0-9]+$")
+_SUFFIXES = ("반", "교실")
+_NON_WORD = re.compile(r"[^0-9A-Za-z가-힣]")
+
+
+def _compact(text: str) -> str:
+    """
+    공백/기호를 없애고 소문자로 바꿔 '라인 댄스'와 '라인댄스'를 같게 취급
+    """
+    return _NON_WORD.sub("", str(text)).lower()
+
+
+def _is_word_tail(rest: str) -> bool:
+    """
+    어절에서 키워드 뒤 나머지가 조사/접미뿐인지 ('교실이', '를' → True, '선생님' → False)
+    """
+    return any(rest.startswith(suffix) and rest[len(suffix):] in _JOSA for suffix in _WORD_SUFFIXES)
+
+
+def is_program_request(text: str) -> bool:
+    """
+    프로그램을 찾거나 배우고 싶다는 요청 문장인지 (하소연/진술은 False)
+    """
+    spaced = re.sub(r"\s+", "", str(text))
+    return any(cue in spaced for cue in _REQUEST_CUES) and not any(cue in spaced for cue in _COMPLAINT_CUES)
+
+
+def program_name_terms(name: str) -> set[str]:
+    """
+    프로그램명에서 검색 키워드 후보 추출
+    예) '라인댄스 중급A' -> {'라인댄스 중급A', '라인댄스'}, '라지볼(탁구)' -> {..., '라지볼', '탁구'}
+    - 한글 두 글자 미만('1반', 'MY', 숫자)과 _STOP_WORDS는 제외 (프로그램명 전체는 항상 포함)
+    """
+    terms = {name.strip()}
+    for token in re.split(r"[\s()\[\],/]+", name):
+        token = _NON_WORD.sub("", token)
+        if token in _LEVEL_WORDS:
+            continue
+        token = _TRAILING_MARK.sub("", token) if re.search("[가-힣]", token) else token
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) > len(suffix) + 1:
+                token = token[: -len(suffix)]
+        token = _TRAILING_MARK.sub("", token) if re.search("[가-힣]", token) else token
+        if token.endswith(_PARTICLES) and len(token) > 2:
+            token = token[:-1]
+        if len(_HANGUL.findall(token)) >= 2 and token not in _LEVEL_WORDS and token not in _STOP_WORDS \
+                and not token.endswith(_MODIFIER_ENDINGS):
+            terms.add(token)
+    return terms
+
+
+class ProgramMatcher:
+    """
+    프로그램명/별칭 사전으로 만든 Aho-Corasick 오토마톤
+    - 사용자 메시지를 한 번 훑어(선형 시간) 언급된 키워드를 찾음
+    - '운동', '실내' 같은 카테고리 단어는 넣지 않음 (일상 대화에 흔해 의도 판단은 planner에 맡김)
+    """
+
+    def __init__(self, terms: dict[str, str]):
+        # terms: 매칭할 문자열 -> DB 검색 키워드
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, str]]] = [[]]
+
+        for term, keyword in terms.items():
+            pattern = _compact(term)
+            if len(pattern) < 2:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), keyword))
+
+        self._build_fail_links()
+        self.size = len(terms)
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                if node:
+                    f = self._fail[node]
+                    while f and ch not in self._goto[f]:
+                        f = self._fail[f]
+                    self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        겹치지 않는 가장 왼쪽-가장 긴 매치 목록 [(start, end, keyword)]
+        - 어절(공백 단위) 첫 글자에서 시작하고, 끝난 어절의 나머지가 조사/접미인 매치만 인정
+          ('필요가' 안의 '요가', '영어선생님'처럼 다른 단어 안에 든 키워드는 무시)
+        """
+        tokens = [t for t in (_compact(token) for token in str(text).split()) if t]
+        text = "".join(tokens)
+        token_starts, token_ends, owner = set(), [], []
+        for token in tokens:
+            token_starts.add(len(owner))
+            owner.extend([len(token_ends)] * len(token))
+            token_ends.append(len(owner))
+
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, keyword in self._out[node]:
+                start, end = i - length + 1, i + 1
+                if start in token_starts and _is_word_tail(text[end:token_ends[owner[i]]]):
+                    matches.append((start, end, keyword))
+
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        selected = []
+        last_end = 0
+        for m in matches:
+            if m[0] >= last_end:
+                selected.append(m)
+                last_end = m[1]
+        return selected
+
+    def match(self, text: str) -> str | None:
+        """
+        모호하지 않은 키워드 하나가 있으면 반환, 없거나 여러 개면 None
+        """
+        keywords = {keyword for _, _, keyword in self.find_all(text)}
+        return keywords.pop() if len(keywords) == 1 else None
+
+
+def build_program_matcher(program_names: list[str], aliases: dict[str, str] = PROGRAM_ALIASES) -> ProgramMatcher:
+    terms: dict[str, str] = {}
+    for name in program_names:
+        for term in program_name_terms(name):
+            terms[term] = term
+    for alias, keyword in aliases.items():
+        terms.setdefault(alias, keyword)
+    return ProgramMatcher(terms)
+
+
+# ---------- 프로세스 단위 캐시 ---------- #
+_lock = threading.Lock()
+_matcher: ProgramMatcher | None = None
+_matcher_catalog: ProgramCatalog | None = None
+
+
+def matcher_for_catalog(catalog: ProgramCatalog) -> ProgramMatcher:
+    """
+    카탈로그 스냅샷이 새로 로드됐을 때만 오토마톤을 다시 만듦
+    """
+    global _matcher, _matcher_catalog
+
+    if _matcher is not None and _matcher_catalog is catalog:
+        return _matcher
+
+    with _lock:
+        if _matcher is None or _matcher_catalog is not catalog:
+            _matcher = build_program_matcher([p.name for p in catalog.programs])
+            _matcher_catalog = catalog
+        return _matcher
+
+
+async def match_program_keyword_async(db: AsyncSession, user_message: str) -> str | None:
+    """
+    GPT 없이 메시지에서 프로그램 키워드를 찾는 fast path (fast_path_keyword 참고)
+    """
+    if len(user_message.strip()) > PROGRAM_MATCHER_MAX_MESSAGE_LEN or not is_program_request(user_message):
+        return None
+    try:
+        return fast_path_keyword(matcher_for_catalog(await get_catalog_async(db)), user_message)
+    except Exception as e:
+        print(f"[ERROR] 프로그램 매처 실패: {e}")
+        return None
+
+
+def fast_path_keyword(matcher: ProgramMatcher, user_message: str) -> str | None:
+    """
+    짧은 요청 문장에서 프로그램명/별칭 하나만 어절 단위로 모호하지 않게 매칭될 때만 키워드 반환
+    - 그 밖(진술/하소연, 다른 단어 안에 든 키워드, 긴 문장)은 None → planner가 의도 판단
+    """
+    if len(user_message.strip()) > PROGRAM_MATCHER_MAX_MESSAGE_LEN or not is_program_request(user_message):
+        return None
+    return matcher.match(user_message)
+
+
+# 매처가 키워드를 찾으면 안 되는 일상 대화 / 찾아야 하는 추천 요청 (python -m utils.program_matcher 로 확인)
+SMALL_TALK_SAMPLES = [
+    "좋은 말 한마디 해주세요",
+    "웃음이 안 나와요",
+    "배우기 너무 어려워요",
+    "우리 손녀 1반이에요",
+    "운동하면 무릎이 아파요",
+    "요즘 힐링이 필요해요",
+    "역사를 좋아했었지",
+    "해피한 하루 보내세요",
+    "오늘 날씨가 좋네요",
+    "필요가 없어요",
+    "그럴 필요가 있나요",
+    "중요가 뭐예요",
+    "아들이 영어 선생님이에요",
+    "컴퓨터가 고장났어요",
+    "스마트폰이 안 켜져요",
+    "그림 같은 날씨네요",
+    "오늘 노래방 갔어요",
+]
+PROGRAM_SAMPLES = {
+    "요가 수업 있어요?": "요가",
+    "라인댄스 배우고 싶어요": "라인댄스",
+    "붓글씨 하는 곳 있나요": "서예",
+    "핸드폰 사용법 알려주는 데": "스마트폰",
+    "피아노 배울 수 있나요": "피아노",
+    "요가교실이 있나요?": "요가",
+    "컴퓨터 배우고 싶어요": "컴퓨터",
+    "서예 있어요?": "서예",
+}
+
+
+def check_samples(matcher: ProgramMatcher) -> bool:
+    """
+    SMALL_TALK_SAMPLES는 매칭되지 않고 PROGRAM_SAMPLES는 기대한 키워드로 매칭되는지 출력, 하나라도 틀리면 False
+    """
+    ok = True
+    for message in SMALL_TALK_SAMPLES:
+        keyword = fast_path_keyword(matcher, message)
+        print(f"[{'ok' if keyword is None else 'FAIL'}] 말벗 '{message}' -> {keyword}")
+        ok = ok and keyword is None
+    for message, expected in PROGRAM_SAMPLES.items():
+        keyword = fast_path_keyword(matcher, message)
+        print(f"[{'ok' if keyword == expected else 'FAIL'}] 추천 '{message}' -> {keyword} (기대 {expected})")
+        ok = ok and keyword == expected
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프로그램명 매처의 말벗/추천 예문 점검")
+    parser.add_argument("--csv", metavar="PATH", default=None,
+                        help="DB 대신 프로그램 CSV(프로그램명 컬럼, 예: data/elderly_program.CSV)로 매처 생성")
+    args = parser.parse_args()
+
+    if args.csv:
+        with open(args.csv, encoding="utf-8-sig") as f:
+            names = sorted({row["프로그램명"] for row in csv.DictReader(f)})
+    else:
+        # relationship의 문자열 참조("Center" 등)를 풀 수 있도록 모든 모델 import
+        from model import center, chat_log, personality, schedule, tag, user  # noqa: F401
+        from utils.database import SessionLocal
+
+        with SessionLocal() as session:
+            names = [p.name for p in get_catalog(session).programs]
+
+    passed = check_samples(build_program_matcher(names))
+    print("[INFO] 프로그램 매처 점검 통과" if passed else "[ERROR] 잘못 매칭되는 예문이 있습니다.")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from utils.database import async_engine, engine
+
+# 현재 요청(태스크)에서 실행된 SQL 수 (count_queries 블록 안에서만 셈)
+_counter: ContextVar[list[str] | None] = ContextVar("query_counter", default=None)
+
+
+class QueryCount:
+    def __init__(self, statements: list[str]):
+        self.statements = statements
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def _on_execute(conn, cursor, statement, parameters, context, executemany):
+    statements = _counter.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+def install_query_counter(*engines) -> None:
+    """
+    엔진에 카운터 리스너 등록 (count_queries 블록 밖에서는 아무것도 하지 않음)
+    """
+    for target in engines:
+        if not event.contains(target, "before_cursor_execute", _on_execute):
+            event.listen(target, "before_cursor_execute", _on_execute)
+
+
+@contextmanager
+def count_queries():
+    """
+    블록 안에서 실행된 SQL 수 세기 (N+1 회귀 확인용)
+
+        with count_queries() as queries:
+            await get_all_schedules_by_id_async(db, user_id)
+        assert queries.count <= 3, queries.statements
+    """
+    install_query_counter(engine, async_engine.sync_engine)
+    result = QueryCount([])
+    token = _counter.set(result.statements)
+    try:
+        yield result
+    finally:
+        _counter.reset(token)
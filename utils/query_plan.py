@@ -0,0 +1,292 @@
+"""
+자주 호출되는 crud 조회의 실행 계획 점검 (인덱스 회귀 확인용)
+
+    python -m utils.query_plan                  # DATABASE_URL 대상 (스테이징 / 운영 복제본)
+    python -m utils.query_plan --sqlite 50000   # 메모리 SQLite에 모델 스키마 + 대화 로그 5만 건 시드 후 점검
+
+- 실제 crud 함수를 실행하면서 나간 SQL을 잡아 같은 파라미터로 EXPLAIN
+- 테이블 전체 스캔(SQLite: SCAN <table>, MySQL: type ALL / index)이 있으면 종료 코드 1
+- QUERY_BUDGETS의 라우트 응답(TestClient)이 허용된 쿼리 수를 넘으면(N+1) 종료 코드 1
+- MySQL은 행 수가 적으면 옵티마이저가 일부러 전체 스캔을 고를 수 있으므로 데이터가 충분한 DB에서 실행
+- 같은 점검을 SQLite 시드로 돌리는 테스트: tests/test_query_plans.py (python -m pytest)
+"""
+import argparse
+import asyncio
+import random
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from crud.chat_log import get_chat_logs_page_async, get_last_recommended_program_by_user_id_async, \
+    get_recent_user_messages_async
+from crud.personality import get_latest_personality_by_user_id_async
+from crud.program import get_program_by_name_async
+from crud.schedule import existing_schedule
+from model.base import Base
+from model.center import Center
+from model.chat_log import ChatLog
+from model.personality import Personality
+from model.program import Program, program_tag
+from model.schedule import Schedule
+from model.tag import Tag
+from model.user import User
+from utils.query_counter import QueryCount, count_queries, install_query_counter
+
+# SQLite: SEARCH는 인덱스 탐색, SCAN <table>은 테이블(또는 인덱스) 전체 스캔
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+# MySQL: ALL = 테이블 전체 스캔, index = 인덱스 전체 스캔
+_MYSQL_FULL_SCAN_TYPES = {"ALL", "index"}
+
+
+class Sample:
+    """
+    점검에 쓸 실제 값 (DB에 있는 사용자 / 프로그램)
+    """
+
+    def __init__(self, user_id: int, program_id: int, program_name: str, schedule_user_id: int):
+        self.user_id = user_id
+        self.program_id = program_id
+        self.program_name = program_name
+        self.schedule_user_id = schedule_user_id
+
+
+HotQuery = Callable[[AsyncSession, Sample], Awaitable[object]]
+
+HOT_QUERIES: dict[str, HotQuery] = {
+    "get_last_recommended_program_by_user_id":
+        lambda db, s: get_last_recommended_program_by_user_id_async(s.user_id, db),
+    "get_recent_user_messages":
+        lambda db, s: get_recent_user_messages_async(db, s.user_id, 7),
+    "get_chat_logs_page":
+        lambda db, s: get_chat_logs_page_async(db, s.user_id, 21),
+    "existing_schedule":
+        lambda db, s: db.run_sync(existing_schedule, s.user_id, s.program_id),
+    "get_program_by_name":
+        lambda db, s: get_program_by_name_async(db, s.program_name),
+    "get_latest_personality_by_user_id":
+        lambda db, s: get_latest_personality_by_user_id_async(db, s.user_id),
+}
+
+
+
+# 실제 라우트로 응답(JSON)까지 만들며 지켜야 할 쿼리 수 (결과 행 수와 무관, 관계 lazy load로 인한 N+1 확인)
+# 이름: (경로, SCHEDULE_LOAD_MODE, 예산)
+QUERY_BUDGETS: dict[str, tuple[str, str, int]] = {
+    "GET /schedule (catalog)": ("/schedule", "catalog", 1),
+    "GET /schedule (eager)": ("/schedule", "eager", 3),
+}
+
+
+def full_scans(dialect: str, plan: list[dict]) -> list[str]:
+    """
+    EXPLAIN 결과에서 전체 스캔하는 테이블 목록
+    """
+    tables = set(Base.metadata.tables)
+    found = []
+    for row in plan:
+        if dialect == "sqlite":
+            match = _SQLITE_SCAN.match(str(row.get("detail", "")))
+            if match and match.group(1) in tables:
+                found.append(match.group(1))
+        elif row.get("type") in _MYSQL_FULL_SCAN_TYPES and row.get("table") in tables:
+            found.append(row["table"])
+    return found
+
+
+def _format_plan(dialect: str, plan: list[dict]) -> str:
+    if dialect == "sqlite":
+        return "; ".join(str(row.get("detail")) for row in plan)
+    return "; ".join(
+        f"{row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')}" for row in plan
+    )
+
+
+async def explain_query(db: AsyncSession, run: HotQuery, sample: Sample) -> list[tuple[str, list[dict]]]:
+    """
+    crud 함수를 실행하며 나간 SELECT 문마다 (SQL, EXPLAIN 결과)
+    """
+    conn = await db.connection()
+    dialect = conn.dialect.name
+    statements = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    sync_engine = conn.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await run(db, sample)
+    except HTTPException:
+        # 404 / 409 같은 결과도 쿼리는 이미 실행됨
+        pass
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    plans = []
+    for statement, parameters in statements:
+        result = await conn.exec_driver_sql(prefix + statement, parameters)
+        plans.append((statement, [dict(row) for row in result.mappings().all()]))
+    return plans
+
+
+async def pick_sample(db: AsyncSession) -> Sample:
+    user_id = await db.scalar(select(ChatLog.user_id).order_by(ChatLog.id.desc()).limit(1)) \
+        or await db.scalar(select(User.id).limit(1))
+    program = (await db.execute(select(Program.id, Program.name).limit(1))).first()
+    if user_id is None or program is None:
+        raise SystemExit("[ERROR] 점검할 사용자/프로그램 데이터가 없습니다. (--sqlite N 으로 시드 가능)")
+    # 일정이 가장 많은 사용자 (N+1이면 쿼리 수가 가장 크게 늘어남)
+    schedule_user_id = await db.scalar(
+        select(Schedule.user_id).group_by(Schedule.user_id).order_by(func.count().desc()).limit(1)
+    )
+    return Sample(int(user_id), program.id, program.name, int(schedule_user_id or user_id))
+
+
+def count_budget_queries(engine: AsyncEngine, name: str, sample: Sample) -> tuple[QueryCount, int]:
+    """
+    QUERY_BUDGETS 라우트 하나를 TestClient로 호출하며 나간 SQL 수와 응답 항목 수
+    - DB 세션은 engine에서, 인증은 sample.schedule_user_id로 대체
+    - catalog 모드는 스냅샷을 먼저 읽어 둔 뒤(세지 않음) 요청 하나만 셈
+    """
+    # 라우트/의존성을 그대로 쓰기 위해 앱을 import (EXPLAIN 점검만 할 때는 필요 없음)
+    from fastapi.testclient import TestClient
+
+    import routes.schedule_route as schedule_route
+    from main import app
+    from utils.database import get_async_db
+    from utils.jwt_utils import verify_token
+
+    path, load_mode, _ = QUERY_BUDGETS[name]
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_budget_db():
+        async with session_factory() as db:
+            yield db
+
+    install_query_counter(engine.sync_engine)
+    previous_mode = schedule_route.SCHEDULE_LOAD_MODE
+    app.dependency_overrides[get_async_db] = get_budget_db
+    app.dependency_overrides[verify_token] = lambda: str(sample.schedule_user_id)
+    schedule_route.SCHEDULE_LOAD_MODE = load_mode
+    try:
+        client = TestClient(app)
+        if load_mode == "catalog":
+            client.get(path)
+        with count_queries() as queries:
+            response = client.get(path)
+    finally:
+        schedule_route.SCHEDULE_LOAD_MODE = previous_mode
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(verify_token, None)
+    return queries, len(response.json()) if response.status_code == 200 else 0
+
+
+async def check_query_plans(engine: AsyncEngine) -> bool:
+    """
+    HOT_QUERIES 실행 계획 / QUERY_BUDGETS 쿼리 수 출력, 전체 스캔이나 예산 초과가 하나라도 있으면 False
+    """
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    ok = True
+    async with session_factory() as db:
+        sample = await pick_sample(db)
+        dialect = engine.dialect.name
+        for name, run in HOT_QUERIES.items():
+            for statement, plan in await explain_query(db, run, sample):
+                scanned = full_scans(dialect, plan)
+                mark = "FULL SCAN" if scanned else "ok"
+                print(f"[{mark}] {name}: {_format_plan(dialect, plan)}")
+                if scanned:
+                    ok = False
+                    print(f"    tables={scanned}\n    sql={' '.join(statement.split())}")
+
+    for name, (_, _, budget) in QUERY_BUDGETS.items():
+        queries, rows = count_budget_queries(engine, name, sample)
+        over = queries.count > budget
+        print(f"[{'OVER BUDGET' if over else 'ok'}] {name}: {queries.count} queries (budget {budget}, rows {rows})")
+        if over:
+            ok = False
+            for statement in queries.statements:
+                print(f"    sql={' '.join(statement.split())[:160]}")
+    return ok
+
+
+async def seed_sqlite(engine: AsyncEngine, chat_logs: int) -> None:
+    """
+    모델 스키마 생성 후 대화 로그 chat_logs건 규모의 가짜 데이터 입력
+    """
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    n_users = max(chat_logs // 50, 10)
+    n_programs = 300
+
+    def base(i: int) -> dict:
+        return {"id": i, "created_at": now, "updated_at": now, "deleted": False}
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Center), [
+            {**base(i), "name": f"센터{i}", "latitude": 37.5, "longitude": 127.0, "address": "서울", "tel": "02"}
+            for i in range(1, 11)
+        ])
+        await conn.execute(insert(Tag), [{**base(i), "name": f"태그{i}"} for i in range(1, 18)])
+        await conn.execute(insert(Program), [
+            {**base(i), "name": f"프로그램{i}", "fir_day": "월", "start_time": datetime(2000, 1, 1, 10).time(),
+             "end_time": datetime(2000, 1, 1, 12).time(), "price": 0, "main_category": "운동",
+             "sub_category": "실내", "headcount": "20", "center_id": i % 10 + 1}
+            for i in range(1, n_programs + 1)
+        ])
+        await conn.execute(insert(program_tag), [
+            {"program_id": p, "tag_id": t} for p in range(1, n_programs + 1) for t in rng.sample(range(1, 18), 3)
+        ])
+        await conn.execute(insert(User), [
+            {**base(i), "name": f"user{i}", "phone": f"010{i:08d}", "birth": "1950", "gender": "F",
+             "user_code": f"code{i}"}
+            for i in range(1, n_users + 1)
+        ])
+        await conn.execute(insert(Personality), [
+            {**base(i), "user_id": i, "personality_tags": "태그1,태그2,태그3"} for i in range(1, n_users + 1)
+        ])
+        await conn.execute(insert(Schedule), [
+            {**base(i), "user_id": i % n_users + 1, "program_id": i // n_users % n_programs + 1,
+             "center_id": 1}
+            for i in range(1, min(n_users * 5, n_users * n_programs) + 1)
+        ])
+        for start in range(1, chat_logs + 1, 5000):
+            await conn.execute(insert(ChatLog), [
+                {**base(i), "created_at": now - timedelta(minutes=chat_logs - i), "user_id": rng.randint(1, n_users),
+                 "user_message": "안녕하세요", "assistant_response": "반가워요",
+                 "recommended_program": f"프로그램{rng.randint(1, n_programs)}" if i % 4 == 0 else None}
+                for i in range(start, min(start + 5000, chat_logs + 1))
+            ])
+
+
+async def _main(sqlite_rows: int | None) -> bool:
+    if sqlite_rows is not None:
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    else:
+        from utils.database import async_engine as engine
+    try:
+        if sqlite_rows is not None:
+            await seed_sqlite(engine, sqlite_rows)
+        return await check_query_plans(engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="자주 호출되는 crud 조회의 실행 계획 점검")
+    parser.add_argument("--sqlite", type=int, metavar="CHAT_LOGS", default=None,
+                        help="DATABASE_URL 대신 메모리 SQLite에 대화 로그 CHAT_LOGS건 규모로 시드 후 점검")
+    args = parser.parse_args()
+
+    passed = asyncio.run(_main(args.sqlite))
+    print("[INFO] 실행 계획 점검 통과" if passed else "[ERROR] 전체 스캔하는 조회가 있습니다.")
+    sys.exit(0 if passed else 1)
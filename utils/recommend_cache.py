@@ -0,0 +1,152 @@
+import json
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from model.personality import Personality
+from utils.catalog import get_catalog, get_catalog_async
+from utils.redis_utils import get_async_redis, get_redis_client
+
+load_dotenv()
+
+RECOMMEND_CACHE_PREFIX = "recommend:matches:"
+RECOMMEND_CACHE_TTL = int(os.getenv("RECOMMEND_CACHE_TTL", str(60 * 60 * 24)))
+RECOMMEND_MIN_OVERLAP = 2
+
+
+def _key(user_id) -> str:
+    return f"{RECOMMEND_CACHE_PREFIX}{user_id}"
+
+
+def _rank(catalog, personality: Personality) -> list[list[int]]:
+    return [[p.id, score] for p, score in catalog.rank_tags(personality.tag_list, RECOMMEND_MIN_OVERLAP)]
+
+
+def _dump(catalog_fingerprint: str, matches: list) -> str:
+    return json.dumps({"catalog_fingerprint": catalog_fingerprint, "matches": matches}, separators=(",", ":"))
+
+
+def _cached_matches(cached: str | None, catalog) -> list[tuple[int, int]] | None:
+    """
+    현재 카탈로그 내용(fingerprint)으로 계산된 캐시면 목록, 아니면 None
+    - 성향이 바뀌는 경우는 crud.personality의 생성/수정에서 캐시를 지우므로 여기서는 성향을 다시 읽지 않음
+    """
+    if not cached:
+        return None
+    data = json.loads(cached)
+    if data.get("catalog_fingerprint") != catalog.fingerprint:
+        return None
+    return [(program_id, score) for program_id, score in data["matches"]]
+
+
+def _store(pipe_or_client, user_id, catalog_fingerprint: str, matches: list) -> None:
+    pipe_or_client.setex(_key(user_id), RECOMMEND_CACHE_TTL, _dump(catalog_fingerprint, matches))
+
+
+def get_user_matches(db: Session, user_id) -> list[tuple[int, int]]:
+    """
+    사용자의 추천 프로그램 (program_id, 겹친 태그 수) 목록 (점수 내림차순 → id 오름차순)
+    - Redis에 현재 카탈로그 내용(fingerprint)으로 계산된 결과가 있으면 DB 조회 없이 그대로 사용
+    - 없거나 카탈로그가 바뀌었으면(새 프로그램 등) 그때만 최신 성향을 읽어 계산해 저장
+    """
+    # crud.personality가 이 모듈을 import 하므로 순환 import를 피하려고 함수 안에서 import
+    from crud.personality import get_latest_personality_by_user_id
+
+    catalog = get_catalog(db)
+    try:
+        cached = get_redis_client().get(_key(user_id))
+    except Exception as e:
+        print(f"[ERROR] 추천 캐시 조회 실패: {e}")
+        cached = None
+
+    matches = _cached_matches(cached, catalog)
+    if matches is not None:
+        return matches
+
+    matches = _rank(catalog, get_latest_personality_by_user_id(db, user_id))
+    try:
+        _store(get_redis_client(), user_id, catalog.fingerprint, matches)
+    except Exception as e:
+        print(f"[ERROR] 추천 캐시 저장 실패: {e}")
+
+    return [(program_id, score) for program_id, score in matches]
+
+
+async def get_user_matches_async(db: AsyncSession, user_id) -> list[tuple[int, int]]:
+    """
+    get_user_matches의 async 버전 (AsyncSession + async Redis)
+    """
+    from crud.personality import get_latest_personality_by_user_id_async
+
+    catalog = await get_catalog_async(db)
+    try:
+        cached = await get_async_redis().get(_key(user_id))
+    except Exception as e:
+        print(f"[ERROR] 추천 캐시 조회 실패: {e}")
+        cached = None
+
+    matches = _cached_matches(cached, catalog)
+    if matches is not None:
+        return matches
+
+    matches = _rank(catalog, await get_latest_personality_by_user_id_async(db, user_id))
+    try:
+        await get_async_redis().setex(_key(user_id), RECOMMEND_CACHE_TTL, _dump(catalog.fingerprint, matches))
+    except Exception as e:
+        print(f"[ERROR] 추천 캐시 저장 실패: {e}")
+
+    return [(program_id, score) for program_id, score in matches]
+
+
+def invalidate_user_recommendations(user_id) -> None:
+    """
+    성향이 바뀌면 호출 → 다음 추천 요청에서 다시 계산
+    """
+    try:
+        get_redis_client().delete(_key(user_id))
+    except Exception as e:
+        print(f"[ERROR] 추천 캐시 삭제 실패: {e}")
+
+
+async def invalidate_user_recommendations_async(user_id) -> None:
+    """
+    invalidate_user_recommendations의 async 버전
+    """
+    try:
+        await get_async_redis().delete(_key(user_id))
+    except Exception as e:
+        print(f"[ERROR] 추천 캐시 삭제 실패: {e}")
+
+
+def warm_all_recommendations(db: Session, batch_size: int = 500) -> int:
+    """
+    모든 사용자의 추천 목록을 미리 계산해 Redis에 저장 (일괄 워밍)
+    - 반환: 저장한 사용자 수
+    """
+    catalog = get_catalog(db)
+    latest_ids = select(func.max(Personality.id)).group_by(Personality.user_id)
+    stmt = select(Personality).where(Personality.id.in_(latest_ids)).execution_options(yield_per=batch_size)
+
+    count = 0
+    pipe = get_redis_client().pipeline(transaction=False)
+    for personality in db.scalars(stmt):
+        _store(pipe, personality.user_id, catalog.fingerprint, _rank(catalog, personality))
+        count += 1
+        if count % batch_size == 0:
+            pipe.execute()
+    pipe.execute()
+    return count
+
+
+if __name__ == "__main__":
+    # python -m utils.recommend_cache
+    # relationship의 문자열 참조("Center" 등)를 풀 수 있도록 모든 모델 import
+    from model import center, chat_log, program, schedule, tag, user  # noqa: F401
+    from utils.database import SessionLocal
+
+    with SessionLocal() as session:
+        warmed = warm_all_recommendations(session)
+    print(f"[INFO] 추천 캐시 워밍 완료: {warmed}명")
@@ -1,6 +1,7 @@
 import os
 
 import redis
+import redis.asyncio as aioredis
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,5 +10,99 @@ REDIS_HOST = os.getenv("REDIS_HOST")
 REDIS_PORT = int(os.getenv("REDIS_PORT"))
 REDIS_DB = int(os.getenv("REDIS_DB"))
 
+# 커넥션 풀 설정 (sync/async 풀 각각에 적용, 워커 단위)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))             # 풀이 가득 찼을 때 대기(초)
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "2"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+_client: redis.Redis | None = None
+_async_client: aioredis.Redis | None = None
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "host": REDIS_HOST,
+        "port": REDIS_PORT,
+        "db": REDIS_DB,
+        "decode_responses": True,
+        "max_connections": REDIS_MAX_CONNECTIONS,
+        "timeout": REDIS_POOL_TIMEOUT,
+        "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": REDIS_CONNECT_TIMEOUT,
+        "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+    }
+
+
 def get_redis_client() -> redis.Redis:
-    return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
\ No newline at end of file
+    """
+    프로세스 공용 동기 클라이언트 (FastAPI 의존성으로도 사용)
+    - 요청마다 새 풀/커넥션을 만들지 않고 하나의 BlockingConnectionPool을 공유
+    """
+    global _client
+    if _client is None:
+        _client = redis.Redis(connection_pool=redis.BlockingConnectionPool(**_pool_kwargs()))
+    return _client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    프로세스 공용 비동기 클라이언트 (async 라우트/유틸용)
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool(**_pool_kwargs()))
+    return _async_client
+
+
+def init_redis_pools() -> None:
+    """
+    앱 시작 시 풀 생성 (async 풀은 이벤트 루프 안에서 만들어야 함)
+    """
+    get_redis_client()
+    get_async_redis()
+
+
+async def close_redis_pools() -> None:
+    """
+    앱 종료 시 풀의 모든 커넥션 정리
+    """
+    global _client, _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        await _async_client.connection_pool.disconnect()
+        _async_client = None
+    if _client is not None:
+        _client.close()
+        _client.connection_pool.disconnect()
+        _client = None
+
+
+def get_redis_pool_stats() -> dict:
+    """
+    풀 사용 현황 (현재 워커 기준)
+    - created: 만들어진 커넥션 수 / in_use: 사용 중 / idle: 반납되어 대기 중
+    """
+    stats = {}
+    if _client is not None:
+        pool = _client.connection_pool
+        idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        created = len(pool._connections)
+        stats["sync"] = {
+            "max_connections": pool.max_connections,
+            "created": created,
+            "in_use": created - idle,
+            "idle": idle,
+        }
+    if _async_client is not None:
+        pool = _async_client.connection_pool
+        idle = len(pool._available_connections)
+        in_use = len(pool._in_use_connections)
+        stats["async"] = {
+            "max_connections": pool.max_connections,
+            "created": idle + in_use,
+            "in_use": in_use,
+            "idle": idle,
+        }
+    return stats
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import Awaitable, Callable
+
+from dotenv import load_dotenv
+
+from utils.redis_utils import get_async_redis
+
+load_dotenv()
+
+STT_CACHE_ENABLED = os.getenv("STT_CACHE_ENABLED", "true").lower() == "true"
+STT_CACHE_PREFIX = "stt:transcript:"
+STT_CACHE_LOCK_PREFIX = "stt:lock:"
+STT_CACHE_TTL = int(os.getenv("STT_CACHE_TTL", str(60 * 60 * 24)))           # 전사 결과 보관 시간(초)
+STT_CACHE_LOCK_TTL = int(os.getenv("STT_CACHE_LOCK_TTL", "90"))               # 다른 워커 전사 대기 최대 시간(초)
+STT_CACHE_LOCK_POLL = float(os.getenv("STT_CACHE_LOCK_POLL", "0.2"))
+
+# 락 값이 내 것일 때만 삭제 (다른 워커가 새로 잡은 락을 지우지 않도록)
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# 같은 음성에 대해 워커 안에서 진행 중인 전사 (해시 → 태스크)
+_inflight: dict[str, asyncio.Task] = {}
+
+# 워커 단위 캐시 통계
+_stats = {"hit": 0, "miss": 0, "coalesced": 0, "waited": 0, "error": 0}
+
+
+def audio_digest(audio_bytes: bytes) -> str:
+    return hashlib.sha256(audio_bytes).hexdigest()
+
+
+async def _get_cached(digest: str) -> str | None:
+    try:
+        return await get_async_redis().get(f"{STT_CACHE_PREFIX}{digest}")
+    except Exception as e:
+        print(f"[ERROR] STT 캐시 조회 실패: {e}")
+        _stats["error"] += 1
+        return None
+
+
+async def _acquire_lock(digest: str, owner: str) -> bool:
+    try:
+        return bool(await get_async_redis().set(f"{STT_CACHE_LOCK_PREFIX}{digest}", owner, nx=True, ex=STT_CACHE_LOCK_TTL))
+    except Exception as e:
+        # Redis 장애 시에는 락 없이 진행
+        print(f"[ERROR] STT 락 획득 실패: {e}")
+        _stats["error"] += 1
+        return True
+
+
+async def _wait_for_other_worker(digest: str) -> str | None:
+    """
+    다른 워커가 같은 음성을 전사 중이면 결과가 저장되거나 락이 풀릴 때까지 대기
+    """
+    lock_key = f"{STT_CACHE_LOCK_PREFIX}{digest}"
+    loop = asyncio.get_running_loop()
+    until = loop.time() + STT_CACHE_LOCK_TTL
+    while loop.time() < until:
+        await asyncio.sleep(STT_CACHE_LOCK_POLL)
+        cached = await _get_cached(digest)
+        if cached is not None:
+            return cached
+        try:
+            if not await get_async_redis().exists(lock_key):
+                return None
+        except Exception:
+            return None
+    return None
+
+
+async def _load(digest: str, transcribe: Callable[[], Awaitable[str]]) -> str:
+    cached = await _get_cached(digest)
+    if cached is not None:
+        _stats["hit"] += 1
+        return cached
+
+    owner = uuid.uuid4().hex
+    locked = await _acquire_lock(digest, owner)
+    if not locked:
+        cached = await _wait_for_other_worker(digest)
+        if cached is not None:
+            _stats["waited"] += 1
+            return cached
+        # 다른 워커가 실패했거나 너무 오래 걸림 → 직접 전사
+        locked = await _acquire_lock(digest, owner)
+
+    _stats["miss"] += 1
+    try:
+        text = await transcribe()
+        try:
+            await get_async_redis().set(f"{STT_CACHE_PREFIX}{digest}", text, ex=STT_CACHE_TTL)
+        except Exception as e:
+            print(f"[ERROR] STT 캐시 저장 실패: {e}")
+            _stats["error"] += 1
+        return text
+    finally:
+        if locked:
+            try:
+                await get_async_redis().eval(_RELEASE_LOCK, 1, f"{STT_CACHE_LOCK_PREFIX}{digest}", owner)
+            except Exception as e:
+                print(f"[ERROR] STT 락 해제 실패: {e}")
+
+
+def _finish(digest: str, task: asyncio.Task) -> None:
+    _inflight.pop(digest, None)
+    # 기다리던 요청이 모두 취소된 경우에도 예외가 "never retrieved"로 남지 않게 확인
+    if not task.cancelled():
+        task.exception()
+
+
+async def get_or_transcribe(audio_bytes: bytes, transcribe: Callable[[], Awaitable[str]]) -> str:
+    """
+    음성 바이트의 sha256으로 전사 결과 캐시 조회 → 없으면 transcribe() 호출 후 저장
+    - 워커 안: 같은 음성의 동시 요청은 하나의 태스크를 함께 기다림
+    - 워커 간: Redis SET NX 락을 잡은 워커만 전사하고 나머지는 결과를 기다림
+    - 기다리던 요청이 취소돼도 전사는 계속되어 재시도 요청이 결과를 바로 받음
+      (transcribe()는 스스로 제한 시간을 가져야 함)
+    """
+    if not STT_CACHE_ENABLED:
+        return await transcribe()
+
+    digest = audio_digest(audio_bytes)
+    task = _inflight.get(digest)
+    if task is None:
+        task = asyncio.create_task(_load(digest, transcribe))
+        _inflight[digest] = task
+        task.add_done_callback(lambda t: _finish(digest, t))
+    else:
+        _stats["coalesced"] += 1
+    return await asyncio.shield(task)
+
+
+def get_stt_cache_stats() -> dict:
+    return {**_stats, "inflight": len(_inflight), "enabled": STT_CACHE_ENABLED}
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Awaitable, Callable
+
+import httpx
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from utils.database import AsyncSessionLocal
+from utils.redis_utils import get_async_redis
+from utils.stt_utils import STTError, transcribe_audio
+
+load_dotenv()
+
+STT_JOB_PREFIX = "stt:job:"
+STT_JOB_TTL = int(os.getenv("STT_JOB_TTL", str(60 * 60)))                   # 작업 상태 보관 시간(초)
+STT_JOB_MAX_ATTEMPTS = int(os.getenv("STT_JOB_MAX_ATTEMPTS", "3"))          # STT 단계 최대 시도 횟수
+STT_JOB_RETRY_DELAY = float(os.getenv("STT_JOB_RETRY_DELAY", "1"))          # 재시도 대기(초) × 시도 횟수
+STT_JOB_CONCURRENCY = int(os.getenv("STT_JOB_CONCURRENCY", "16"))           # 워커당 동시 처리 작업 수
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_TRANSCRIBING = "transcribing"
+JOB_RESPONDING = "responding"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# STT 단계에서 재시도할 오류 (챗봇 단계는 대화 로그가 중복 저장될 수 있어 재시도하지 않음)
+RETRYABLE_ERRORS = (STTError, asyncio.TimeoutError, httpx.HTTPError)
+
+ChatbotResponder = Callable[[str, str, AsyncSession], Awaitable[str]]
+
+_semaphore = asyncio.Semaphore(STT_JOB_CONCURRENCY)
+# 실행 중인 작업 (GC로 사라지지 않게 참조 유지, 종료 시 취소)
+_tasks: set[asyncio.Task] = set()
+
+
+def _key(job_id: str) -> str:
+    return f"{STT_JOB_PREFIX}{job_id}"
+
+
+async def _update_job(job_id: str, **fields) -> None:
+    fields["updated_at"] = int(time.time())
+    async with get_async_redis().pipeline(transaction=True) as pipe:
+        pipe.hset(_key(job_id), mapping={k: "" if v is None else str(v) for k, v in fields.items()})
+        pipe.expire(_key(job_id), STT_JOB_TTL)
+        await pipe.execute()
+
+
+async def get_job(job_id: str) -> dict | None:
+    job = await get_async_redis().hgetall(_key(job_id))
+    if not job:
+        return None
+    job["job_id"] = job_id
+    job["attempts"] = int(job.get("attempts") or 0)
+    return job
+
+
+async def submit_stt_job(
+    user_id: str,
+    audio_bytes: bytes,
+    filename: str,
+    content_type: str,
+    respond: ChatbotResponder,
+) -> str:
+    """
+    음성 작업 등록 후 바로 job_id 반환
+    - STT → 챗봇 응답은 백그라운드 태스크에서 처리하고 상태는 Redis 해시(stt:job:{id})에 기록
+    - respond: (user_id, user_message, db) → 챗봇 응답 (routes.chat_route.get_chatbot_response)
+    """
+    job_id = uuid.uuid4().hex
+    now = int(time.time())
+    await _update_job(job_id, user_id=user_id, status=JOB_QUEUED, attempts=0, created_at=now)
+
+    task = asyncio.create_task(_run_job(job_id, user_id, audio_bytes, filename, content_type, respond))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job_id
+
+
+async def _transcribe_with_retry(job_id: str, audio_bytes: bytes, filename: str, content_type: str) -> str:
+    for attempt in range(1, STT_JOB_MAX_ATTEMPTS + 1):
+        await _update_job(job_id, status=JOB_TRANSCRIBING, attempts=attempt)
+        try:
+            return await transcribe_audio(audio_bytes, filename, content_type)
+        except RETRYABLE_ERRORS as e:
+            print(f"[ERROR] STT 작업 실패 ({job_id}, {attempt}/{STT_JOB_MAX_ATTEMPTS}): {e!r}")
+            if attempt == STT_JOB_MAX_ATTEMPTS:
+                raise
+            await asyncio.sleep(STT_JOB_RETRY_DELAY * attempt)
+
+
+async def _run_job(
+    job_id: str,
+    user_id: str,
+    audio_bytes: bytes,
+    filename: str,
+    content_type: str,
+    respond: ChatbotResponder,
+) -> None:
+    async with _semaphore:
+        try:
+            user_message = await _transcribe_with_retry(job_id, audio_bytes, filename, content_type)
+            await _update_job(job_id, status=JOB_RESPONDING, user_message=user_message)
+
+            # 요청이 이미 끝났으므로 세션을 직접 엶
+            async with AsyncSessionLocal() as db:
+                chatbot_response = await respond(user_id, user_message, db)
+
+            await _update_job(job_id, status=JOB_COMPLETED, chatbot_response=chatbot_response)
+        except asyncio.CancelledError:
+            await asyncio.shield(_update_job(job_id, status=JOB_FAILED, error="서버 종료로 작업이 취소되었습니다."))
+            raise
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e) or e.__class__.__name__
+            print(f"[ERROR] 음성 작업 처리 실패 ({job_id}): {detail}")
+            try:
+                await _update_job(job_id, status=JOB_FAILED, error=detail)
+            except Exception as redis_error:
+                print(f"[ERROR] 음성 작업 상태 저장 실패 ({job_id}): {redis_error}")
+
+
+async def shutdown_stt_jobs() -> None:
+    """
+    앱 종료 시 진행 중인 작업 취소 (상태는 failed로 남음)
+    """
+    for task in list(_tasks):
+        task.cancel()
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
@@ -0,0 +1,55 @@
+import json
+import os
+from urllib.parse import urlencode
+
+from dotenv import load_dotenv
+from websockets.asyncio.client import ClientConnection, connect
+
+from utils.stt_utils import fetch_token_from_return_zero
+
+load_dotenv()
+
+# ReturnZero 실시간(스트리밍) STT 설정
+RETURN_ZERO_STREAM_URL = os.getenv("RETURN_ZERO_STREAM_URL", "wss://openapi.vito.ai/v1/transcribe:streaming")
+STT_STREAM_SAMPLE_RATE = int(os.getenv("STT_STREAM_SAMPLE_RATE", "16000"))
+STT_STREAM_ENCODING = os.getenv("STT_STREAM_ENCODING", "LINEAR16")      # 클라이언트가 보내는 오디오 형식
+STT_STREAM_CONNECT_TIMEOUT = float(os.getenv("STT_STREAM_CONNECT_TIMEOUT", "5"))
+
+# 스트림 종료 신호 (ReturnZero 규약)
+STT_STREAM_EOS = "EOS"
+
+
+def stream_url() -> str:
+    params = {
+        "sample_rate": STT_STREAM_SAMPLE_RATE,
+        "encoding": STT_STREAM_ENCODING,
+        "use_itn": "true",
+        "use_disfluency_filter": "true",
+        "use_profanity_filter": "false",
+    }
+    return f"{RETURN_ZERO_STREAM_URL}?{urlencode(params)}"
+
+
+async def open_stt_stream() -> ClientConnection:
+    """
+    ReturnZero 스트리밍 STT 웹소켓 연결
+    - 오디오 청크는 바이너리 프레임으로 보내고, 끝나면 STT_STREAM_EOS 텍스트 전송
+    """
+    token = await fetch_token_from_return_zero()
+    return await connect(
+        stream_url(),
+        additional_headers={"Authorization": f"bearer {token}"},
+        open_timeout=STT_STREAM_CONNECT_TIMEOUT,
+    )
+
+
+def parse_stt_message(raw: str | bytes) -> dict | None:
+    """
+    ReturnZero 결과 메시지 → {"text": str, "final": bool} (텍스트가 없으면 None)
+    """
+    message = json.loads(raw)
+    alternatives = message.get("alternatives") or []
+    text = alternatives[0].get("text", "").strip() if alternatives else ""
+    if not text:
+        return None
+    return {"text": text, "final": bool(message.get("final"))}
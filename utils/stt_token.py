@@ -0,0 +1,177 @@
+import asyncio
+import os
+import time
+import uuid
+
+import httpx
+from redis import exceptions as redis_exceptions
+from dotenv import load_dotenv
+
+from utils.redis_utils import get_async_redis
+
+load_dotenv()
+
+RETURN_ZERO_CLIENT = os.getenv('RETURN_ZERO_CLIENT')
+RETURN_ZERO_SECRET = os.getenv('RETURN_ZERO_SECRET')
+RETURN_ZERO_JWT_URL = os.getenv('RETURN_ZERO_JWT_URL')
+RETURN_ZERO_TOKEN_KEY = os.getenv('RETURN_ZERO_TOKEN_KEY')
+
+# 토큰 유효 시간(응답에 expire_at이 없을 때), 만료 몇 초 전부터 백그라운드 갱신할지, 만료 몇 초 전부터는 쓰지 않을지
+STT_TOKEN_DEFAULT_TTL = int(os.getenv("STT_TOKEN_DEFAULT_TTL", str(60 * 60 * 6)))
+STT_TOKEN_REFRESH_AHEAD = int(os.getenv("STT_TOKEN_REFRESH_AHEAD", str(30 * 60)))
+STT_TOKEN_MIN_TTL = int(os.getenv("STT_TOKEN_MIN_TTL", "60"))
+STT_TOKEN_LOCK_TTL = int(os.getenv("STT_TOKEN_LOCK_TTL", "10"))
+STT_TOKEN_HTTP_TIMEOUT = float(os.getenv("STT_TOKEN_HTTP_TIMEOUT", "10"))
+
+# 락 값이 내 것일 때만 삭제
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class STTTokenError(Exception):
+    pass
+
+
+class ReturnZeroTokenManager:
+    """
+    ReturnZero 토큰을 워커 메모리에 만료 시각과 함께 보관
+    - 평소에는 Redis/HTTP 호출 없이 메모리 값 반환
+    - 만료 STT_TOKEN_REFRESH_AHEAD초 전부터는 백그라운드에서 미리 갱신
+    - 갱신은 Redis 락을 잡은 워커 하나만 하고, 나머지 워커는 Redis에 저장된 새 토큰을 가져감
+    - 토큰 값은 로그에 남기지 않음
+    """
+
+    def __init__(self):
+        self._token: str | None = None
+        self._expires_at = 0.0          # time.time() 기준
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        self._http: httpx.AsyncClient | None = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=httpx.Timeout(STT_TOKEN_HTTP_TIMEOUT))
+        return self._http
+
+    def _usable(self, now: float) -> bool:
+        return self._token is not None and now < self._expires_at - STT_TOKEN_MIN_TTL
+
+    async def get_token(self) -> str:
+        now = time.time()
+        if self._usable(now):
+            if now >= self._expires_at - STT_TOKEN_REFRESH_AHEAD:
+                self._schedule_refresh()
+            return self._token
+
+        # 워커 안에서는 한 요청만 갱신하고 나머지는 결과를 기다림
+        async with self._lock:
+            if not self._usable(time.time()):
+                await self._refresh()
+            return self._token
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            async with self._lock:
+                if time.time() < self._expires_at - STT_TOKEN_REFRESH_AHEAD:
+                    return
+                await self._refresh()
+        except Exception as e:
+            # 기존 토큰이 아직 유효하므로 다음 요청에서 다시 시도
+            print(f"[ERROR] STT 토큰 미리 갱신 실패: {e}")
+
+    async def _load_shared(self) -> tuple[str, float] | None:
+        """
+        다른 워커가 저장한 토큰 (남은 TTL로 만료 시각 계산)
+        """
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            pipe.get(RETURN_ZERO_TOKEN_KEY)
+            pipe.ttl(RETURN_ZERO_TOKEN_KEY)
+            token, ttl = await pipe.execute()
+        if not token or ttl is None or ttl <= 0:
+            return None
+        return token, time.time() + ttl
+
+    def _adopt(self, shared: tuple[str, float] | None, min_ttl: int) -> bool:
+        if shared and shared[1] - time.time() > min_ttl:
+            self._token, self._expires_at = shared
+            return True
+        return False
+
+    async def _refresh(self) -> None:
+        redis = get_async_redis()
+        lock_key = f"{RETURN_ZERO_TOKEN_KEY}:lock"
+        owner = uuid.uuid4().hex
+        try:
+            if self._adopt(await self._load_shared(), STT_TOKEN_REFRESH_AHEAD):
+                return
+
+            locked = await redis.set(lock_key, owner, nx=True, ex=STT_TOKEN_LOCK_TTL)
+            if not locked:
+                # 다른 워커가 갱신 중 → 새 토큰이 저장될 때까지 대기
+                deadline = time.monotonic() + STT_TOKEN_LOCK_TTL
+                shared = None
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(0.1)
+                    shared = await self._load_shared()
+                    if self._adopt(shared, STT_TOKEN_REFRESH_AHEAD):
+                        return
+                # 갱신하던 워커가 실패 → 아직 쓸 수 있는 토큰이 있으면 사용, 없으면 직접 발급
+                if self._adopt(shared, STT_TOKEN_MIN_TTL):
+                    return
+        except Exception as e:
+            # Redis 장애 시에는 워커 단독으로 발급
+            print(f"[ERROR] STT 토큰 공유 저장소 사용 실패: {e}")
+            locked = False
+
+        try:
+            token, expires_at = await self._fetch()
+            self._token, self._expires_at = token, expires_at
+            ttl = int(expires_at - time.time())
+            if ttl > 0:
+                await redis.setex(RETURN_ZERO_TOKEN_KEY, ttl, token)
+        except redis_exceptions.RedisError as e:
+            print(f"[ERROR] STT 토큰 공유 저장 실패: {e}")
+        finally:
+            if locked:
+                try:
+                    await redis.eval(_RELEASE_LOCK, 1, lock_key, owner)
+                except redis_exceptions.RedisError as e:
+                    print(f"[ERROR] STT 토큰 락 해제 실패: {e}")
+
+    async def _fetch(self) -> tuple[str, float]:
+        data = {
+            "client_id": RETURN_ZERO_CLIENT,
+            "client_secret": RETURN_ZERO_SECRET
+        }
+        headers = {
+            "accept": "application/json",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        response = await self._get_http().post(RETURN_ZERO_JWT_URL, headers=headers, data=data)
+        if response.status_code != 200:
+            # 응답 본문에 토큰/비밀값이 섞일 수 있어 상태 코드만 남김
+            raise STTTokenError(f"STT token request failed: {response.status_code}")
+
+        token_data = response.json()
+        expires_at = float(token_data.get("expire_at") or time.time() + STT_TOKEN_DEFAULT_TTL)
+        return token_data["access_token"], expires_at
+
+    def expires_in(self) -> int:
+        return max(int(self._expires_at - time.time()), 0) if self._token else 0
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        if self._http is not None:
+            await self._http.aclose()
+
+
+token_manager = ReturnZeroTokenManager()
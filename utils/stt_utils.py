@@ -1,87 +1,91 @@
+import asyncio
 import os
-import time
-from typing import Any, Coroutine
+from typing import Any
 
-import requests
+import httpx
 from fastapi import UploadFile
 from dotenv import load_dotenv
-from redis import Redis
+from utils.audio_utils import normalize_for_stt
+from utils.stt_cache import get_or_transcribe
+from utils.stt_token import token_manager
 
 load_dotenv()
 
-RETURN_ZERO_CLIENT = os.getenv('RETURN_ZERO_CLIENT')
-RETURN_ZERO_SECRET = os.getenv('RETURN_ZERO_SECRET')
 RETURN_ZERO_URL = os.getenv('RETURN_ZERO_URL')
-RETURN_ZERO_JWT_URL = os.getenv('RETURN_ZERO_JWT_URL')
-RETURN_ZERO_TOKEN_KEY = os.getenv('RETURN_ZERO_TOKEN_KEY')
+# 결과 조회 URL ({id} 자리에 전사 요청 id). 없으면 RETURN_ZERO_URL/{id}
+RETURN_ZERO_RESULT_URL = os.getenv('RETURN_ZERO_RESULT_URL')
 
-def fetch_token_from_return_zero(redis: Redis) -> str:
-    if redis.exists(RETURN_ZERO_TOKEN_KEY):
-        print(f'redis cache hit => key : {RETURN_ZERO_TOKEN_KEY}, value {redis.get(RETURN_ZERO_TOKEN_KEY)}')
-        return redis.get(RETURN_ZERO_TOKEN_KEY)
+# 호출/폴링 설정 (환경 변수로 조정 가능)
+STT_DEADLINE = float(os.getenv("STT_DEADLINE", "60"))                   # 요청 ~ 결과까지 전체 제한 시간(초)
+STT_HTTP_TIMEOUT = float(os.getenv("STT_HTTP_TIMEOUT", "10"))           # HTTP 호출 1건당 타임아웃(초)
+STT_POLL_INITIAL = float(os.getenv("STT_POLL_INITIAL", "0.3"))          # 첫 폴링 간격(초)
+STT_POLL_MAX = float(os.getenv("STT_POLL_MAX", "2"))                    # 최대 폴링 간격(초)
+STT_POLL_BACKOFF = float(os.getenv("STT_POLL_BACKOFF", "1.5"))          # 간격 증가 배수
+STT_MAX_CONNECTIONS = int(os.getenv("STT_MAX_CONNECTIONS", "50"))
 
-    data = {
-        "client_id": RETURN_ZERO_CLIENT,
-        "client_secret": RETURN_ZERO_SECRET
-    }
+STT_CONFIG = '{"model_name": "whisper", "language": "ko"}'
 
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/x-www-form-urlencoded"
-    }
+# 워커 전체에서 공유하는 비동기 HTTP 클라이언트 (커넥션 재사용)
+_http = httpx.AsyncClient(
+    timeout=httpx.Timeout(STT_HTTP_TIMEOUT),
+    limits=httpx.Limits(max_connections=STT_MAX_CONNECTIONS),
+)
 
-    response = requests.post(RETURN_ZERO_JWT_URL, headers=headers, data=data)
 
-    token_data = response.json()
+class STTError(Exception):
+    pass
 
-    token = token_data["access_token"]
-    print(f'token: {token}')
-    redis.setex(RETURN_ZERO_TOKEN_KEY, 60*60*6, token)
 
-    return token
+def _result_url(transcribe_id: str) -> str:
+    if RETURN_ZERO_RESULT_URL:
+        return RETURN_ZERO_RESULT_URL.format(id=transcribe_id)
+    return f"{RETURN_ZERO_URL.rstrip('/')}/{transcribe_id}"
 
-async def try_stt(audio_file: UploadFile, redis: Redis) -> str | None | Any:
-    # 토큰 가져오기 (레디스 캐시 활용)
-    token = fetch_token_from_return_zero(redis)
-    if isinstance(token, bytes):
-        token = token.decode()
 
-    # 파일 바이트 읽기
-    audio_bytes = await audio_file.read()
+async def fetch_token_from_return_zero() -> str:
+    """
+    ReturnZero 토큰 (워커 메모리 캐시, 만료 전 백그라운드 갱신 → utils.stt_token)
+    """
+    return await token_manager.get_token()
+
 
-    # multipart/form-data 구성
+async def transcribe(audio_bytes: bytes, filename: str, content_type: str, token: str) -> str:
+    """
+    전사 요청 후 결과가 나올 때까지 폴링
+    - 폴링 간격은 STT_POLL_INITIAL부터 STT_POLL_BACKOFF배씩 늘려 STT_POLL_MAX까지
+    - 짧은 음성은 빨리 끝나므로 처음엔 자주, 길어질수록 드물게 확인
+    """
     files = {
-        "file": (audio_file.filename, audio_bytes, audio_file.content_type),
-        "config": (None, '{"model_name": "whisper", "language": "ko"}')
+        "file": (filename, audio_bytes, content_type),
+        "config": (None, STT_CONFIG)
     }
-
     headers = {
         "accept": "application/json",
         "Authorization": f"Bearer {token}"
     }
 
     # STT API 요청
-    response = requests.post(RETURN_ZERO_URL, headers=headers, files=files)
-
-    # 응답 결과 반환
+    response = await _http.post(RETURN_ZERO_URL, headers=headers, files=files)
     if response.status_code != 200:
-        raise Exception(f"STT request failed: {response.status_code}, {response.text}")
+        raise STTError(f"STT request failed: {response.status_code}, {response.text}")
 
-    result = response.json()
+    result_url = _result_url(response.json()["id"])
+    interval = STT_POLL_INITIAL
 
-    max_attempts = 30
-    interval = 2
+    while True:
+        await asyncio.sleep(interval)
+        interval = min(interval * STT_POLL_BACKOFF, STT_POLL_MAX)
 
-    for _ in range(max_attempts):
-        stt_result_reponse = requests.get(
-            'https://openapi.vito.ai/v1/transcribe/' + result["id"],
-            headers={"Authorization": f"Bearer {token}"},
-        )
+        stt_result_response = await _http.get(result_url, headers={"Authorization": f"Bearer {token}"})
 
-        if stt_result_reponse.status_code != 200:
-            raise Exception(f"STT request failed: {response.status_code}, {response.text}")
+        # 폴링 요청 제한에 걸리면 실패 대신 최대 간격으로 늦춤
+        if stt_result_response.status_code == 429:
+            interval = STT_POLL_MAX
+            continue
+        if stt_result_response.status_code != 200:
+            raise STTError(f"STT request failed: {stt_result_response.status_code}, {stt_result_response.text}")
 
-        stt_result = stt_result_reponse.json()
+        stt_result = stt_result_response.json()
 
         if stt_result["status"] == "completed":
             utterances = stt_result.get("results", {}).get("utterances", [])
@@ -89,6 +93,51 @@ async def try_stt(audio_file: UploadFile, redis: Redis) -> str | None | Any:
                 return utterances[0]["msg"]  # ✅ msg 값만 반환
             return ""
         elif stt_result["status"] == "failed":
-            raise Exception(f"STT request failed: {response.status_code}, {response.text}")
-        else:
-            time.sleep(interval)
\ No newline at end of file
+            raise STTError(f"STT transcribe failed: {stt_result}")
+
+
+async def try_stt(audio_file: UploadFile, deadline: float | None = None) -> str | None | Any:
+    """
+    음성 파일 → 텍스트
+    - deadline(초, 기본 STT_DEADLINE)을 넘기면 asyncio.TimeoutError
+    - 클라이언트 연결이 끊겨 요청이 취소되면 폴링도 즉시 중단됨 (CancelledError 전파)
+    """
+    # 파일 바이트 읽기
+    audio_bytes = await audio_file.read()
+    return await transcribe_audio(audio_bytes, audio_file.filename, audio_file.content_type, deadline)
+
+
+async def transcribe_audio(
+    audio_bytes: bytes,
+    filename: str,
+    content_type: str,
+    deadline: float | None = None,
+) -> str:
+    """
+    이미 읽어 둔 음성 바이트 → 텍스트 (백그라운드 작업 등 UploadFile이 없는 곳에서 사용)
+    - 같은 음성(정규화 후 sha256)은 캐시된 전사 결과를 사용하고, 동시에 들어온 같은 음성은 한 번만 전사
+    """
+    timeout = deadline or STT_DEADLINE
+
+    async def _upload(data: bytes, name: str, media_type: str) -> str:
+        # 토큰 가져오기 (평소에는 메모리 값)
+        token = await fetch_token_from_return_zero()
+        return await transcribe(data, name, media_type, token)
+
+    async def _run():
+        # mono/16kHz/무음 제거로 업로드 크기 축소 (비활성화·실패 시 원본 그대로)
+        data, name, media_type = await normalize_for_stt(audio_bytes, filename, content_type)
+        # 요청이 취소돼도 공유 전사는 계속되므로 전사 자체에도 제한 시간을 둠
+        return await get_or_transcribe(
+            data, lambda: asyncio.wait_for(_upload(data, name, media_type), timeout=timeout)
+        )
+
+    return await asyncio.wait_for(_run(), timeout=timeout)
+
+
+async def close_stt_client():
+    """
+    앱 종료 시 공유 커넥션 풀 정리
+    """
+    await _http.aclose()
+    await token_manager.close()
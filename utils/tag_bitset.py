@@ -0,0 +1,59 @@
+import numpy as np
+
+# 성향 태그 어휘 (migrate.analyze_program_category, personality_route.analyze_mbti_tags와 동일한 17개)
+PERSONALITY_TAGS = (
+    "외향적", "사회적", "내향적", "정적인", "현실적", "체험형", "창의적", "예술적", "분석적",
+    "논리적", "감성적", "교류형", "구조적", "조직적", "자유로운", "유동적", "활동적",
+)
+TAG_BITS = {name: 1 << i for i, name in enumerate(PERSONALITY_TAGS)}
+
+# numpy < 2.0 에는 bitwise_count가 없어 바이트 단위 popcount 테이블 사용
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def encode_tags(tag_names) -> int:
+    """
+    태그 이름 목록 → 비트마스크 (어휘에 없는 태그는 무시)
+    """
+    mask = 0
+    for name in tag_names:
+        mask |= TAG_BITS.get(str(name).strip(), 0)
+    return mask
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT8[values.view(np.uint8)].reshape(-1, values.dtype.itemsize).sum(axis=1)
+
+
+class TagBitsetIndex:
+    """
+    프로그램별 태그를 uint32 비트마스크 배열로 보관하고
+    AND + popcount 한 번으로 전체 카탈로그의 태그 겹침 수를 계산
+    """
+    __slots__ = ("masks",)
+
+    def __init__(self, tag_sets):
+        self.masks = np.fromiter((encode_tags(tags) for tags in tag_sets), dtype=np.uint32)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def scores(self, user_mask: int) -> np.ndarray:
+        return popcount(self.masks & np.uint32(user_mask))
+
+    def match(self, user_mask: int, threshold: int = 2, top_k: int | None = None) -> list[tuple[int, int]]:
+        """
+        겹치는 태그 수가 threshold 이상인 (인덱스, 점수) 목록
+        - 점수 내림차순, 같은 점수는 인덱스 오름차순(안정 정렬)
+        - top_k가 주어지면 상위 k개만
+        """
+        if not len(self.masks):
+            return []
+        scores = self.scores(user_mask)
+        indices = np.flatnonzero(scores >= threshold)
+        order = np.argsort(-scores[indices].astype(np.int16), kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return [(int(indices[i]), int(scores[indices[i]])) for i in order]